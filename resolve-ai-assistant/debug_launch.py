@@ -5,124 +5,169 @@ Provides detailed diagnostics and verbose output
 
 import sys
 import os
+import io
+import importlib
 import traceback
 
-print("=" * 80)
-print("DaVinci Resolve AI Assistant - Debug Mode")
-print("=" * 80)
-print()
+
+# Third-party packages required by the assistant
+DEPENDENCIES = tuple((sys.intern(name), description) for name, description in (
+    ("rich", "Rich console formatting"),
+    ("requests", "HTTP requests"),
+    ("websocket", "WebSocket client"),
+    ("PIL", "Pillow image processing"),
+))
+
+# Assistant modules imported in Step 6
+ASSISTANT_MODULES = tuple((sys.intern(name), description) for name, description in (
+    ("resolve_ai.controller", "DaVinci Resolve Controller"),
+    ("resolve_ai.copilot_cli", "GitHub Copilot CLI"),
+    ("resolve_ai.fusion_tools", "Fusion Node Builder"),
+    ("resolve_ai.comfyui_client", "ComfyUI Client"),
+    ("resolve_ai.task_router", "Task Router"),
+    ("resolve_ai.console_ui", "Console UI"),
+    ("resolve_ai.assistant", "Main Assistant"),
+))
+
+
+# Diagnostics are collected per step and written to the console in one go
+_buf = io.StringIO()
+
+
+def log(line=""):
+    """Append a line to the current step's report"""
+    _buf.write(f"{line}\n")
+
+
+def flush():
+    """Write the buffered report to stdout and reset the buffer"""
+    sys.stdout.write(_buf.getvalue())
+    sys.stdout.flush()
+    _buf.seek(0)
+    _buf.truncate()
+
+
+log("=" * 80)
+log("DaVinci Resolve AI Assistant - Debug Mode")
+log("=" * 80)
+log()
+flush()
 
 # Step 1: Python environment
-print("📍 Step 1: Checking Python Environment")
-print(f"   Python Version: {sys.version}")
-print(f"   Python Executable: {sys.executable}")
-print(f"   Current Directory: {os.getcwd()}")
-print()
+log("📍 Step 1: Checking Python Environment")
+log(f"   Python Version: {sys.version}")
+log(f"   Python Executable: {sys.executable}")
+log(f"   Current Directory: {os.getcwd()}")
+log()
+flush()
 
 # Step 2: Add source to path
-print("📍 Step 2: Setting up Python Path")
+log("📍 Step 2: Setting up Python Path")
 src_path = r"c:\Users\satya\davinci-resolve-extension-builder\resolve-ai-assistant\src"
 sys.path.insert(0, src_path)
-print(f"   Added to sys.path: {src_path}")
-print()
+log(f"   Added to sys.path: {src_path}")
+log()
+flush()
 
 # Step 3: Check dependencies
-print("📍 Step 3: Checking Dependencies")
-dependencies = {
-    "rich": "Rich console formatting",
-    "requests": "HTTP requests",
-    "websocket": "WebSocket client",
-    "PIL": "Pillow image processing"
-}
-
-for module_name, description in dependencies.items():
+log("📍 Step 3: Checking Dependencies")
+modules = sys.modules
+for module_name, description in DEPENDENCIES:
+    # Really import on a miss: a broken install (e.g. a missing native
+    # library under PIL) is found but fails to load
     try:
-        __import__(module_name)
-        print(f"   ✓ {module_name:15} - {description}")
-    except ImportError as e:
-        print(f"   ✗ {module_name:15} - MISSING ({e})")
-print()
+        if module_name not in modules:
+            importlib.import_module(module_name)
+        log(f"   ✓ {module_name:15} - {description}")
+    except Exception as e:
+        log(f"   ✗ {module_name:15} - MISSING ({e})")
+log()
+flush()
 
 # Step 4: Check DaVinci Resolve API
-print("📍 Step 4: Checking DaVinci Resolve API")
-try:
-    # Try direct import
-    import DaVinciResolveScript as dvr
-    print("   ✓ DaVinciResolveScript imported directly")
-except ImportError:
-    print("   ⚠ Direct import failed, trying with RESOLVE_SCRIPT_API path...")
-    
-    resolve_api = os.getenv("RESOLVE_SCRIPT_API")
-    if resolve_api:
-        print(f"   RESOLVE_SCRIPT_API = {resolve_api}")
-        modules_path = os.path.join(resolve_api, "Modules")
-        if os.path.exists(modules_path):
-            print(f"   Adding to path: {modules_path}")
-            sys.path.append(modules_path)
-            try:
-                import DaVinciResolveScript as dvr
-                print("   ✓ DaVinciResolveScript imported via RESOLVE_SCRIPT_API")
-            except ImportError as e:
-                print(f"   ✗ Still failed: {e}")
+log("📍 Step 4: Checking DaVinci Resolve API")
+DEFAULT_MODULES_PATH = r"C:\ProgramData\Blackmagic Design\DaVinci Resolve\Support\Developer\Scripting\Modules"
+resolve_modules_path = None  # First candidate directory that exists
+dvr_module = None  # Bound once here and reused by Step 5
+
+if "DaVinciResolveScript" in sys.modules:
+    dvr_module = sys.modules["DaVinciResolveScript"]
+    log("   ✓ DaVinciResolveScript already loaded")
+else:
+    try:
+        # Try direct import
+        import DaVinciResolveScript as dvr
+        dvr_module = dvr
+        log("   ✓ DaVinciResolveScript imported directly")
+    except ImportError:
+        log("   ⚠ Direct import failed, searching Resolve API paths...")
+
+        resolve_api = os.getenv("RESOLVE_SCRIPT_API")
+        if resolve_api:
+            log(f"   RESOLVE_SCRIPT_API = {resolve_api}")
         else:
-            print(f"   ✗ Modules path doesn't exist: {modules_path}")
-    else:
-        print("   ✗ RESOLVE_SCRIPT_API environment variable not set")
-        
-        # Try default path
-        default_path = r"C:\ProgramData\Blackmagic Design\DaVinci Resolve\Support\Developer\Scripting\Modules"
-        if os.path.exists(default_path):
-            print(f"   Trying default path: {default_path}")
-            sys.path.append(default_path)
+            log("   ✗ RESOLVE_SCRIPT_API environment variable not set")
+
+        candidates = [os.path.join(resolve_api, "Modules")] if resolve_api else []
+        candidates.append(DEFAULT_MODULES_PATH)
+
+        # One stat per candidate; stop at the first directory that exists
+        for candidate in candidates:
+            try:
+                os.stat(candidate)
+            except OSError:
+                log(f"   ✗ Path doesn't exist: {candidate}")
+                continue
+            resolve_modules_path = candidate
+            break
+
+        if resolve_modules_path:
+            log(f"   Adding to path: {resolve_modules_path}")
+            sys.path.append(resolve_modules_path)
             try:
                 import DaVinciResolveScript as dvr
-                print("   ✓ DaVinciResolveScript imported via default path")
+                dvr_module = dvr
+                log("   ✓ DaVinciResolveScript imported via Resolve API path")
             except ImportError as e:
-                print(f"   ✗ Failed with default path: {e}")
-        else:
-            print(f"   ✗ Default path doesn't exist: {default_path}")
-print()
+                log(f"   ✗ Still failed: {e}")
+log()
+flush()
 
 # Step 5: Try to connect to Resolve
-print("📍 Step 5: Connecting to DaVinci Resolve")
-try:
-    import DaVinciResolveScript as dvr
-    resolve = dvr.scriptapp("Resolve")
-    if resolve:
-        print("   ✓ Connected to DaVinci Resolve")
-        pm = resolve.GetProjectManager()
-        project = pm.GetCurrentProject()
-        if project:
-            print(f"   ✓ Project open: {project.GetName()}")
+log("📍 Step 5: Connecting to DaVinci Resolve")
+if dvr_module is None:
+    log("   ✗ Skipping connection - DaVinciResolveScript not available")
+else:
+    try:
+        resolve = dvr_module.scriptapp("Resolve")
+        if resolve:
+            log("   ✓ Connected to DaVinci Resolve")
+            pm = resolve.GetProjectManager()
+            project = pm.GetCurrentProject()
+            if project:
+                log(f"   ✓ Project open: {project.GetName()}")
+            else:
+                log("   ✗ No project is currently open")
         else:
-            print("   ✗ No project is currently open")
-    else:
-        print("   ✗ Could not connect to DaVinci Resolve")
-        print("   Make sure DaVinci Resolve is running")
-except Exception as e:
-    print(f"   ✗ Connection failed: {e}")
-    traceback.print_exc()
-print()
+            log("   ✗ Could not connect to DaVinci Resolve")
+            log("   Make sure DaVinci Resolve is running")
+    except Exception as e:
+        log(f"   ✗ Connection failed: {e}")
+        log(traceback.format_exc().rstrip())
+log()
+flush()
 
 # Step 6: Import assistant modules
-print("📍 Step 6: Importing Assistant Modules")
-modules_to_check = [
-    ("resolve_ai.controller", "DaVinci Resolve Controller"),
-    ("resolve_ai.copilot_cli", "GitHub Copilot CLI"),
-    ("resolve_ai.fusion_tools", "Fusion Node Builder"),
-    ("resolve_ai.comfyui_client", "ComfyUI Client"),
-    ("resolve_ai.task_router", "Task Router"),
-    ("resolve_ai.console_ui", "Console UI"),
-    ("resolve_ai.assistant", "Main Assistant")
-]
-
-for module_name, description in modules_to_check:
+log("📍 Step 6: Importing Assistant Modules")
+for module_name, description in ASSISTANT_MODULES:
     try:
-        __import__(module_name)
-        print(f"   ✓ {module_name:30} - {description}")
+        if module_name not in modules:
+            importlib.import_module(module_name)
+        log(f"   ✓ {module_name:30} - {description}")
     except Exception as e:
-        print(f"   ✗ {module_name:30} - FAILED: {e}")
-print()
+        log(f"   ✗ {module_name:30} - FAILED: {e}")
+log()
+flush()
 
 # Step 7: Launch assistant
 print("📍 Step 7: Launching Assistant")
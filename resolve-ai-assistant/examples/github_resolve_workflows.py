@@ -3,10 +3,24 @@ GitHub + DaVinci Resolve Integration Examples
 Demonstrates combined workflows using both systems
 """
 
-from resolve_ai.controller import ResolveAIController
+from resolve_ai.controller import get_controller
 from resolve_ai.fusion_tools import FusionNodeBuilder
 from resolve_ai.github_executor import GitHubExecutor
 
+
+def set_render_range(timeline, seconds: int = 20):
+    """Limit the timeline in/out range to the first `seconds` of footage"""
+    frame_rate = float(timeline.GetSetting("timelineFrameRate") or "24")
+    out_frame = str(int(seconds * frame_rate))
+    settings = {
+        "useInOutRange": "1",
+        "inFrame": "0",
+        "outFrame": out_frame,
+    }
+    # The Resolve API has no bulk setter for timeline settings
+    for key, value in settings.items():
+        timeline.SetSetting(key, value)
+
 # Example 1: Bug Report with Video Evidence
 def bug_report_with_video():
     """
@@ -20,7 +34,7 @@ def bug_report_with_video():
     """
     
     # Initialize controllers
-    controller = ResolveAIController()
+    controller = get_controller()
     github = GitHubExecutor()
     
     # Step 1: Create composition showing the bug
@@ -44,10 +58,7 @@ def bug_report_with_video():
     
     # Step 2: Set 20s render range
     timeline = controller.get_current_timeline()
-    frame_rate = float(timeline.GetSetting("timelineFrameRate") or "24")
-    timeline.SetSetting("useInOutRange", "1")
-    timeline.SetSetting("inFrame", "0")
-    timeline.SetSetting("outFrame", str(int(20 * frame_rate)))
+    set_render_range(timeline, 20)
     
     # Step 3: Play preview (user sees the bug)
     timeline.Play()
@@ -104,7 +115,7 @@ def feature_demo_pr():
     3. Create PR with demo description
     """
     
-    controller = ResolveAIController()
+    controller = get_controller()
     github = GitHubExecutor()
     
     # Create demo composition
@@ -233,7 +244,7 @@ def create_release_with_demo():
     3. Create GitHub release with notes
     """
     
-    controller = ResolveAIController()
+    controller = get_controller()
     github = GitHubExecutor()
     
     # Create demo composition
@@ -317,7 +328,7 @@ def issue_driven_workflow():
     """
     
     github = GitHubExecutor()
-    controller = ResolveAIController()
+    controller = get_controller()
     
     # Step 1: View issue
     success, issue = github.execute(
@@ -374,7 +385,7 @@ def complete_workflow():
     """
     
     github = GitHubExecutor()
-    controller = ResolveAIController()
+    controller = get_controller()
     
     # Step 1: Check if feature already requested
     print("🔍 Checking existing issues...")
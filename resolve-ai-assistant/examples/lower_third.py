@@ -3,8 +3,10 @@ Example: Lower-Third Template Generator
 Demonstrates building complete lower-third graphics
 """
 
-from resolve_ai.controller import ResolveAIController
-from resolve_ai.fusion_tools import FusionNodeBuilder
+from functools import lru_cache
+
+from resolve_ai.controller import get_controller
+from resolve_ai.fusion_tools import FusionNodeBuilder, GraphSpec, NodeSpec
 
 
 def create_simple_lower_third(title: str, subtitle: str = ""):
@@ -12,7 +14,7 @@ def create_simple_lower_third(title: str, subtitle: str = ""):
     
     print(f"Creating lower-third for: {title}")
     
-    controller = ResolveAIController()
+    controller = get_controller()
     comp = controller.get_fusion_comp()
     
     if not comp:
@@ -33,12 +35,88 @@ def create_simple_lower_third(title: str, subtitle: str = ""):
     print(f"✓ Lower-third created with {len(nodes)} nodes")
 
 
+# Different styles
+STYLES = {
+    "corporate": {
+        "bg_color": (0.0, 0.2, 0.4, 0.95),
+        "text_color": (1.0, 1.0, 1.0),
+        "accent_color": (0.0, 0.8, 1.0)
+    },
+    "modern": {
+        "bg_color": (0.1, 0.1, 0.1, 0.9),
+        "text_color": (1.0, 1.0, 1.0),
+        "accent_color": (1.0, 0.3, 0.0)
+    },
+    "elegant": {
+        "bg_color": (0.2, 0.15, 0.25, 0.85),
+        "text_color": (0.95, 0.9, 0.85),
+        "accent_color": (0.8, 0.6, 0.9)
+    }
+}
+
+
+@lru_cache(maxsize=None)
+def _custom_lower_third_template(style: str, with_subtitle: bool) -> GraphSpec:
+    """Build the node graph for a style once; text is filled in per call"""
+    style_config = STYLES[style]
+    
+    spec = GraphSpec()
+    
+    # Background moved to lower-third position
+    spec.add("background", "LT_Background",
+             color=style_config["bg_color"], x_pos=0, y_pos=0)
+    spec.add("transform", "LT_Position",
+             center=(0.5, 0.15), size=0.45, x_pos=1, y_pos=0)
+    spec.connect("LT_Background", "LT_Position")
+    
+    # Accent bar
+    spec.add("background", "LT_Accent",
+             color=(*style_config["accent_color"], 1.0), x_pos=0, y_pos=1)
+    spec.add("transform", "LT_AccentPos",
+             center=(0.5, 0.12), size=0.1, x_pos=1, y_pos=1)
+    spec.connect("LT_Accent", "LT_AccentPos")
+    
+    # Merge accent onto background
+    spec.add("merge", "LT_BG_Merge", x_pos=2, y_pos=0)
+    spec.connect("LT_Position", "LT_BG_Merge", "Background")
+    spec.connect("LT_AccentPos", "LT_BG_Merge", "Foreground")
+    
+    # Title text
+    spec.add("text", "LT_Title", text="", font="Arial", size=0.08,
+             color=style_config["text_color"], x_pos=3, y_pos=0)
+    spec.add("merge", "LT_Title_Merge", x_pos=4, y_pos=0)
+    spec.connect("LT_BG_Merge", "LT_Title_Merge", "Background")
+    spec.connect("LT_Title", "LT_Title_Merge", "Foreground")
+    
+    # Subtitle if provided
+    if with_subtitle:
+        spec.add("text", "LT_Subtitle", text="", font="Arial", size=0.05,
+                 color=style_config["text_color"], x_pos=5, y_pos=0)
+        spec.add("merge", "LT_Final_Merge", x_pos=6, y_pos=0)
+        spec.connect("LT_Title_Merge", "LT_Final_Merge", "Background")
+        spec.connect("LT_Subtitle", "LT_Final_Merge", "Foreground")
+    
+    return spec
+
+
+def _fill_text(template: GraphSpec, texts: dict) -> GraphSpec:
+    """Copy a template graph, setting the text of the named nodes"""
+    return GraphSpec(
+        nodes=[
+            NodeSpec(node.kind, node.name, {**node.params, "text": texts[node.name]})
+            if node.name in texts else node
+            for node in template.nodes
+        ],
+        edges=template.edges,
+    )
+
+
 def create_custom_lower_third(title: str, subtitle: str, style: str = "corporate"):
     """Create a custom-styled lower-third"""
     
     print(f"Creating {style} lower-third...")
     
-    controller = ResolveAIController()
+    controller = get_controller()
     comp = controller.get_fusion_comp()
     
     if not comp:
@@ -48,93 +126,13 @@ def create_custom_lower_third(title: str, subtitle: str, style: str = "corporate
     builder = FusionNodeBuilder(comp)
     builder.clear_composition()
     
-    # Different styles
-    styles = {
-        "corporate": {
-            "bg_color": (0.0, 0.2, 0.4, 0.95),
-            "text_color": (1.0, 1.0, 1.0),
-            "accent_color": (0.0, 0.8, 1.0)
-        },
-        "modern": {
-            "bg_color": (0.1, 0.1, 0.1, 0.9),
-            "text_color": (1.0, 1.0, 1.0),
-            "accent_color": (1.0, 0.3, 0.0)
-        },
-        "elegant": {
-            "bg_color": (0.2, 0.15, 0.25, 0.85),
-            "text_color": (0.95, 0.9, 0.85),
-            "accent_color": (0.8, 0.6, 0.9)
-        }
-    }
-    
-    style_config = styles.get(style, styles["corporate"])
-    
-    # Create background
-    bg = builder.create_background_node(
-        color=style_config["bg_color"],
-        name="LT_Background",
-        x_pos=0, y_pos=0
+    template = _custom_lower_third_template(
+        style if style in STYLES else "corporate",
+        bool(subtitle)
     )
+    spec = _fill_text(template, {"LT_Title": title, "LT_Subtitle": subtitle})
     
-    # Transform background to lower-third position
-    bg_transform = builder.create_transform_node(
-        name="LT_Position",
-        center=(0.5, 0.15),  # Lower third position
-        size=0.45,
-        x_pos=1, y_pos=0
-    )
-    builder.connect_nodes(bg, bg_transform)
-    
-    # Add accent bar
-    accent = builder.create_background_node(
-        color=(*style_config["accent_color"], 1.0),
-        name="LT_Accent",
-        x_pos=0, y_pos=1
-    )
-    
-    accent_transform = builder.create_transform_node(
-        name="LT_AccentPos",
-        center=(0.5, 0.12),
-        size=0.1,
-        x_pos=1, y_pos=1
-    )
-    builder.connect_nodes(accent, accent_transform)
-    
-    # Merge accent onto background
-    merge1 = builder.create_merge_node(name="LT_BG_Merge", x_pos=2, y_pos=0)
-    builder.connect_nodes(bg_transform, merge1, input_name="Background")
-    builder.connect_nodes(accent_transform, merge1, input_name="Foreground")
-    
-    # Create title text
-    title_node = builder.create_text_node(
-        text=title,
-        name="LT_Title",
-        font="Arial",
-        size=0.08,
-        color=style_config["text_color"],
-        x_pos=3, y_pos=0
-    )
-    
-    # Merge title
-    merge2 = builder.create_merge_node(name="LT_Title_Merge", x_pos=4, y_pos=0)
-    builder.connect_nodes(merge1, merge2, input_name="Background")
-    builder.connect_nodes(title_node, merge2, input_name="Foreground")
-    
-    # Create subtitle if provided
-    if subtitle:
-        subtitle_node = builder.create_text_node(
-            text=subtitle,
-            name="LT_Subtitle",
-            font="Arial",
-            size=0.05,
-            color=style_config["text_color"],
-            x_pos=5, y_pos=0
-        )
-        
-        # Merge subtitle
-        merge3 = builder.create_merge_node(name="LT_Final_Merge", x_pos=6, y_pos=0)
-        builder.connect_nodes(merge2, merge3, input_name="Background")
-        builder.connect_nodes(subtitle_node, merge3, input_name="Foreground")
+    builder.build_graph(spec, undo_name="BuildLowerThird")
     
     print(f"✓ {style.capitalize()} lower-third created!")
 
@@ -148,7 +146,7 @@ def create_broadcast_lower_third(
     
     print(f"Creating broadcast lower-third for {name}...")
     
-    controller = ResolveAIController()
+    controller = get_controller()
     comp = controller.get_fusion_comp()
     
     if not comp:
@@ -158,57 +156,34 @@ def create_broadcast_lower_third(
     builder = FusionNodeBuilder(comp)
     builder.clear_composition()
     
-    # Dark semi-transparent background
-    bg = builder.create_background_node(
-        color=(0.05, 0.05, 0.1, 0.85),
-        name="Broadcast_BG",
-        x_pos=0
-    )
+    spec = GraphSpec()
     
-    bg_transform = builder.create_transform_node(
-        name="Broadcast_Position",
-        center=(0.5, 0.14),
-        size=0.5,
-        x_pos=1
-    )
-    builder.connect_nodes(bg, bg_transform)
-    
-    # Name text (larger)
-    name_text = builder.create_text_node(
-        text=name,
-        name="Broadcast_Name",
-        size=0.09,
-        color=(1.0, 1.0, 1.0),
-        x_pos=2
-    )
+    # Dark semi-transparent background
+    spec.add("background", "Broadcast_BG", color=(0.05, 0.05, 0.1, 0.85), x_pos=0)
+    spec.add("transform", "Broadcast_Position", center=(0.5, 0.14), size=0.5, x_pos=1)
+    spec.connect("Broadcast_BG", "Broadcast_Position")
     
-    # Add subtle glow to name
-    name_glow = builder.create_glow_node(
-        name="Name_Glow",
-        glow_size=5.0,
-        gain=0.8,
-        x_pos=3
-    )
-    builder.connect_nodes(name_text, name_glow)
+    # Name text (larger) with subtle glow
+    spec.add("text", "Broadcast_Name", text=name, size=0.09,
+             color=(1.0, 1.0, 1.0), x_pos=2)
+    spec.add("glow", "Name_Glow", glow_size=5.0, gain=0.8, x_pos=3)
+    spec.connect("Broadcast_Name", "Name_Glow")
     
     # Merge name
-    merge1 = builder.create_merge_node(name="Broadcast_Name_Merge", x_pos=4)
-    builder.connect_nodes(bg_transform, merge1, input_name="Background")
-    builder.connect_nodes(name_glow, merge1, input_name="Foreground")
+    spec.add("merge", "Broadcast_Name_Merge", x_pos=4)
+    spec.connect("Broadcast_Position", "Broadcast_Name_Merge", "Background")
+    spec.connect("Name_Glow", "Broadcast_Name_Merge", "Foreground")
     
     # Role text (smaller, below name)
-    role_text = builder.create_text_node(
-        text=role,
-        name="Broadcast_Role",
-        size=0.05,
-        color=(0.9, 0.9, 1.0),
-        x_pos=5
-    )
+    spec.add("text", "Broadcast_Role", text=role, size=0.05,
+             color=(0.9, 0.9, 1.0), x_pos=5)
     
     # Merge role
-    merge2 = builder.create_merge_node(name="Broadcast_Final", x_pos=6)
-    builder.connect_nodes(merge1, merge2, input_name="Background")
-    builder.connect_nodes(role_text, merge2, input_name="Foreground")
+    spec.add("merge", "Broadcast_Final", x_pos=6)
+    spec.connect("Broadcast_Name_Merge", "Broadcast_Final", "Background")
+    spec.connect("Broadcast_Role", "Broadcast_Final", "Foreground")
+    
+    builder.build_graph(spec, undo_name="BuildBroadcastLowerThird")
     
     print("✓ Broadcast lower-third created!")
     print("\nNote: Text positions may need manual adjustment in Fusion UI")
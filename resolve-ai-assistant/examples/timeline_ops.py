@@ -3,15 +3,51 @@ Example: Timeline Operations
 Demonstrates timeline management, markers, and media import
 """
 
-from resolve_ai.controller import ResolveAIController
+import os
+from typing import AbstractSet, Iterator
+from resolve_ai.controller import get_controller
 from pathlib import Path
 
 
+# Menu choices for create_new_project_timeline()
+FPS_CHOICES = {"1": "24", "2": "25", "3": "30", "4": "60"}
+RESOLUTION_CHOICES = {
+    "1": (1920, 1080),
+    "2": (3840, 2160),
+    "3": (2560, 1440),
+    "4": (1280, 720)
+}
+
+# Supported video/image/audio formats
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.mov', '.avi', '.mkv', '.mxf', '.r3d'})
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.exr', '.dpx'})
+AUDIO_EXTENSIONS = frozenset({'.wav', '.mp3', '.aac', '.aif', '.aiff'})
+MEDIA_EXTENSIONS = VIDEO_EXTENSIONS | IMAGE_EXTENSIONS | AUDIO_EXTENSIONS
+
+
+def _find_media_files(root: str, extensions: AbstractSet[str]) -> Iterator[str]:
+    """Recursively yield paths under root whose extension is in extensions"""
+    try:
+        entries = os.scandir(root)
+    except PermissionError:
+        # e.g. System Volume Information or $RECYCLE.BIN on a drive root
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _find_media_files(entry.path, extensions)
+                continue
+            name = entry.name
+            dot = name.rfind('.')
+            if dot >= 0 and name[dot:].lower() in extensions:
+                yield entry.path
+
+
 def show_project_info():
     """Display current project information"""
     
     print("Fetching project information...")
-    controller = ResolveAIController()
+    controller = get_controller()
     
     status = controller.get_status()
     
@@ -41,7 +77,7 @@ def add_scene_markers():
     """Add color-coded markers for different scene types"""
     
     print("Adding scene markers...")
-    controller = ResolveAIController()
+    controller = get_controller()
     
     # Example markers for a typical video structure
     markers = [
@@ -52,13 +88,12 @@ def add_scene_markers():
         (1440, "Red", "Outro", "End credits and call-to-action"),
     ]
     
-    for frame, color, name, note in markers:
-        success = controller.add_marker(
-            frame_id=frame,
-            color=color,
-            name=name,
-            note=note
-        )
+    results = controller.add_markers([
+        {"frame_id": frame, "color": color, "name": name, "note": note}
+        for frame, color, name, note in markers
+    ])
+    
+    for (frame, color, name, note), success in zip(markers, results):
         if success:
             print(f"  ✓ Added {color} marker at frame {frame}: {name}")
         else:
@@ -79,8 +114,7 @@ def create_new_project_timeline():
     print("  4. 60 fps (High frame rate)")
     
     fps_choice = input("Select frame rate (1-4): ")
-    fps_map = {"1": "24", "2": "25", "3": "30", "4": "60"}
-    frame_rate = fps_map.get(fps_choice, "24")
+    frame_rate = FPS_CHOICES.get(fps_choice, "24")
     
     print("\nResolution options:")
     print("  1. 1920x1080 (Full HD)")
@@ -89,15 +123,9 @@ def create_new_project_timeline():
     print("  4. 1280x720 (HD)")
     
     res_choice = input("Select resolution (1-4): ")
-    res_map = {
-        "1": (1920, 1080),
-        "2": (3840, 2160),
-        "3": (2560, 1440),
-        "4": (1280, 720)
-    }
-    resolution = res_map.get(res_choice, (1920, 1080))
-    
-    controller = ResolveAIController()
+    resolution = RESOLUTION_CHOICES.get(res_choice, (1920, 1080))
+    
+    controller = get_controller()
     success = controller.create_timeline(
         name=timeline_name,
         frame_rate=frame_rate,
@@ -124,34 +152,28 @@ def import_media_from_folder():
         print(f"❌ Folder not found: {folder_path}")
         return
     
-    # Supported video/image formats
-    video_extensions = {'.mp4', '.mov', '.avi', '.mkv', '.mxf', '.r3d'}
-    image_extensions = {'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.exr', '.dpx'}
-    audio_extensions = {'.wav', '.mp3', '.aac', '.aif', '.aiff'}
-    
-    all_extensions = video_extensions | image_extensions | audio_extensions
-    
     # Find all media files
-    media_files = []
-    for file in folder.rglob('*'):
-        if file.suffix.lower() in all_extensions:
-            media_files.append(str(file))
+    media_files = list(_find_media_files(str(folder), MEDIA_EXTENSIONS))
     
     if not media_files:
         print(f"❌ No media files found in {folder_path}")
         return
     
-    print(f"\nFound {len(media_files)} media files:")
-    for i, file in enumerate(media_files[:10], 1):  # Show first 10
-        print(f"  {i}. {Path(file).name}")
+    lines = [f"\nFound {len(media_files)} media files:"]
+    lines += [
+        f"  {i}. {os.path.basename(file)}"
+        for i, file in enumerate(media_files[:10], 1)  # Show first 10
+    ]
     
     if len(media_files) > 10:
-        print(f"  ... and {len(media_files) - 10} more")
+        lines.append(f"  ... and {len(media_files) - 10} more")
+    
+    print("\n".join(lines))
     
     confirm = input(f"\nImport all {len(media_files)} files? (y/n): ")
     
     if confirm.lower() == 'y':
-        controller = ResolveAIController()
+        controller = get_controller()
         success = controller.import_media(media_files)
         
         if success:
@@ -160,26 +182,39 @@ def import_media_from_folder():
             print("\n✗ Import failed")
 
 
-def list_media_pool():
-    """List all items in the media pool"""
+def list_media_pool(verbose: bool = False, limit: int = 20):
+    """
+    List items in the media pool
+    
+    Args:
+        verbose: List every item instead of the first `limit`
+        limit: Number of items shown when not verbose
+    """
     
     print("Fetching media pool items...\n")
     
-    controller = ResolveAIController()
+    controller = get_controller()
     items = controller.get_media_pool_items()
     
     if not items:
         print("📭 Media pool is empty")
         return
     
-    print(f"📚 Media Pool ({len(items)} items):\n")
+    shown = items if verbose else items[:limit]
+    
+    lines = [f"📚 Media Pool ({len(items)} items):\n"]
+    for i, item in enumerate(shown, 1):
+        lines.append(f"{i}. {item['name']}")
+        lines.append(f"   Duration: {item['duration']}")
+        lines.append(f"   FPS: {item['fps']}")
+        lines.append(f"   Resolution: {item['resolution']}")
+        lines.append("")
     
-    for i, item in enumerate(items, 1):
-        print(f"{i}. {item['name']}")
-        print(f"   Duration: {item['duration']}")
-        print(f"   FPS: {item['fps']}")
-        print(f"   Resolution: {item['resolution']}")
-        print()
+    if len(items) > len(shown):
+        lines.append(f"... and {len(items) - len(shown)} more (pass verbose=True to list all)")
+    
+    # One write instead of four per item
+    print("\n".join(lines))
 
 
 def batch_add_chapter_markers():
@@ -190,25 +225,28 @@ def batch_add_chapter_markers():
     interval = int(input("Interval in seconds (e.g., 300 for 5 minutes): "))
     num_chapters = int(input("Number of chapters: "))
     
-    controller = ResolveAIController()
+    controller = get_controller()
     
-    # Get current timeline frame rate
-    project_info = controller.get_project_info()
-    frame_rate = float(project_info.get('frame_rate', 24))
+    # Get current timeline frame rate (one setting read, not the full project info)
+    timeline = controller.get_current_timeline()
+    frame_rate = float((timeline and timeline.GetSetting("timelineFrameRate")) or 24)
     
     print(f"\nAdding {num_chapters} chapter markers at {interval}s intervals...")
     
-    for i in range(num_chapters):
-        frame = int(i * interval * frame_rate)
-        success = controller.add_marker(
-            frame_id=frame,
-            color="Cyan",
-            name=f"Chapter {i + 1}",
-            note=f"Chapter marker at {i * interval}s"
-        )
-        
-        if success:
-            print(f"  ✓ Chapter {i + 1} at frame {frame} ({i * interval}s)")
+    # round() avoids floor drift at fractional rates such as 23.976
+    markers = [
+        {
+            "frame_id": round(i * interval * frame_rate),
+            "color": "Cyan",
+            "name": f"Chapter {i + 1}",
+            "note": f"Chapter marker at {i * interval}s"
+        }
+        for i in range(num_chapters)
+    ]
+    
+    results = controller.add_markers(markers)
+    
+    print(f"  ✓ Added {sum(results)}/{len(markers)} chapter markers")
 
 
 if __name__ == "__main__":
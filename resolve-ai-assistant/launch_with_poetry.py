@@ -1,4 +1,4 @@
-"""
+r"""
 Alternative launcher using Poetry environment
 
 This script runs the assistant using Poetry's managed Python environment,
@@ -11,10 +11,52 @@ Usage from DaVinci Resolve Console:
 import subprocess
 import sys
 import os
+from pathlib import Path
 
 # Path to Poetry environment
 POETRY_PATH = r"c:\Users\satya\davinci-resolve-extension-builder\resolve-ai-assistant"
 
+# Interpreter of the Poetry venv, remembered after the first launch
+VENV_PYTHON_CACHE = Path.home() / ".cache" / "resolve-ai" / "venv_python.txt"
+
+# Bootstrap module run with `python -m` (uses cached bytecode)
+BOOTSTRAP_MODULE = "resolve_ai._bootstrap"
+
+
+def _resolve_venv_python():
+    """
+    Find the Poetry venv interpreter, asking Poetry only on the first run
+    
+    Returns:
+        Path to the venv's python executable
+    """
+    try:
+        cached = VENV_PYTHON_CACHE.read_text().strip()
+        if cached and os.path.exists(cached):
+            return cached
+    except OSError:
+        pass
+    
+    venv_path = Path(subprocess.check_output(
+        ["poetry", "env", "info", "-p"],
+        cwd=POETRY_PATH,
+        text=True
+    ).strip())
+    
+    if os.name == "nt":
+        python_exe = venv_path / "Scripts" / "python.exe"
+    else:
+        python_exe = venv_path / "bin" / "python"
+    
+    try:
+        VENV_PYTHON_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        VENV_PYTHON_CACHE.write_text(str(python_exe))
+    except OSError:
+        pass
+    
+    return str(python_exe)
+
+
 def launch_with_poetry():
     """Launch assistant using Poetry's Python environment"""
     
@@ -24,22 +66,14 @@ def launch_with_poetry():
     # Change to project directory
     os.chdir(POETRY_PATH)
     
-    # Run with Poetry
-    cmd = [
-        "poetry",
-        "run",
-        "python",
-        "-c",
-        """
-import sys
-sys.path.insert(0, "src")
-from resolve_ai.console_ui import launch_console_ui
-launch_console_ui()
-"""
-    ]
-    
     try:
-        subprocess.run(cmd, check=True)
+        # Run the venv interpreter directly instead of going through `poetry run`
+        cmd = [_resolve_venv_python(), "-m", BOOTSTRAP_MODULE]
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [os.path.join(POETRY_PATH, "src"), env.get("PYTHONPATH")])
+        )
+        subprocess.run(cmd, check=True, env=env)
     except subprocess.CalledProcessError as e:
         print(f"\n❌ Error launching assistant: {e}")
         print("\nTroubleshooting:")
@@ -8,24 +8,55 @@ packages so they're available when running scripts from the Resolve console.
 import subprocess
 import sys
 import os
+import json
 from pathlib import Path
 
 
+# Remembers the interpreter found by find_resolve_python() between runs
+SETUP_CACHE_PATH = Path.home() / ".cache" / "resolve-ai" / "setup.json"
+
+
+def _python_folder_order(python_exe: Path):
+    """Sort key for Python* folders: plain "Python" first, then by version (39 before 311)"""
+    version = python_exe.parent.name[len("Python"):]
+    if not version:
+        return (0, 0, 0)
+    if not version.isdigit():
+        return (2, 0, 0)
+    return (1, int(version[0]), int(version[1:] or 0))
+
+
 def find_resolve_python():
     """Find DaVinci Resolve's Python interpreter"""
     
-    # Common paths for Windows
-    possible_paths = [
-        r"C:\Program Files\Blackmagic Design\DaVinci Resolve\python.exe",
-        r"C:\Program Files\Blackmagic Design\DaVinci Resolve\Python\python.exe",
-        r"C:\Program Files\Blackmagic Design\DaVinci Resolve\Python39\python.exe",
-        r"C:\Program Files\Blackmagic Design\DaVinci Resolve\Python311\python.exe",
+    # Reuse the interpreter found on a previous run if it's still there
+    try:
+        cached = json.loads(SETUP_CACHE_PATH.read_text()).get("python")
+        if cached and os.path.exists(cached):
+            print(f"✓ Found DaVinci Resolve Python: {cached}")
+            return cached
+    except (OSError, ValueError, AttributeError):
+        pass
+    
+    # Resolve ships python.exe at the top level or in a Python* subfolder.
+    # Tried top level first, then Python, then Python39, Python311, ... by version.
+    resolve_dir = Path(
+        os.environ.get("PROGRAMFILES", r"C:\Program Files")
+    ) / "Blackmagic Design" / "DaVinci Resolve"
+    candidates = [
+        resolve_dir / "python.exe",
+        *sorted(resolve_dir.glob("Python*/python.exe"), key=_python_folder_order),
     ]
     
-    for path in possible_paths:
-        if os.path.exists(path):
+    for path in candidates:
+        if path.exists():
             print(f"✓ Found DaVinci Resolve Python: {path}")
-            return path
+            try:
+                SETUP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                SETUP_CACHE_PATH.write_text(json.dumps({"python": str(path)}))
+            except OSError:
+                pass
+            return str(path)
     
     print("⚠️  Could not find DaVinci Resolve's Python interpreter")
     print("    Will use system Python instead")
@@ -45,11 +76,33 @@ def install_packages(python_exe):
     print("\n📦 Installing packages...")
     print(f"   Using Python: {python_exe}\n")
     
+    pip_cmd = [
+        python_exe, "-m", "pip", "install",
+        "--disable-pip-version-check",
+        "--no-input",
+    ]
+    
+    # Resolve and install everything in a single pip run
+    print(f"   Installing {', '.join(packages)}...")
+    try:
+        subprocess.run(
+            pip_cmd + packages,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        for package in packages:
+            print(f"   ✓ {package} installed")
+        return True
+    except subprocess.CalledProcessError:
+        print("   ⚠ Combined install failed, retrying packages one at a time...")
+    
+    # Fall back to per-package installs to pinpoint the failure
     for package in packages:
         print(f"   Installing {package}...")
         try:
-            result = subprocess.run(
-                [python_exe, "-m", "pip", "install", package],
+            subprocess.run(
+                pip_cmd + [package],
                 capture_output=True,
                 text=True,
                 check=True
@@ -63,6 +116,21 @@ def install_packages(python_exe):
     return True
 
 
+# Imports every module in one interpreter and prints "<module> <version|FAIL>"
+VERIFY_SCRIPT = """
+import importlib, sys
+ok = True
+for name in sys.argv[1:]:
+    try:
+        module = importlib.import_module(name)
+        print(name, getattr(module, "__version__", "OK"))
+    except Exception:
+        print(name, "FAIL")
+        ok = False
+sys.exit(0 if ok else 1)
+"""
+
+
 def verify_installation(python_exe):
     """Verify packages are installed"""
     
@@ -70,20 +138,20 @@ def verify_installation(python_exe):
     
     modules = ["rich", "requests", "websocket", "PIL"]
     
-    for module in modules:
-        try:
-            result = subprocess.run(
-                [python_exe, "-c", f"import {module}; print('{module}:', {module}.__version__ if hasattr({module}, '__version__') else 'OK')"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            print(f"   ✓ {result.stdout.strip()}")
-        except subprocess.CalledProcessError:
+    result = subprocess.run(
+        [python_exe, "-c", VERIFY_SCRIPT, *modules],
+        capture_output=True,
+        text=True
+    )
+    
+    for line in result.stdout.splitlines():
+        module, _, version = line.partition(" ")
+        if version == "FAIL":
             print(f"   ✗ {module} not available")
-            return False
+        else:
+            print(f"   ✓ {module}: {version}")
     
-    return True
+    return result.returncode == 0
 
 
 def main():
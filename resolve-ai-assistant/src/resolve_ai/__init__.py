@@ -5,18 +5,27 @@ AI-powered automation for DaVinci Resolve with Fusion node control
 DaVinci Resolve extension using GitHub Copilot CLI and ComfyUI integration.
 """
 
+import importlib
+
 __version__ = "0.2.0"
 
-from resolve_ai.controller import ResolveAIController
-from resolve_ai.fusion_tools import FusionNodeBuilder
-from resolve_ai.copilot_cli import CopilotCLI
-from resolve_ai.comfyui_client import ComfyUIClient
-from resolve_ai.task_router import TaskRouter
-from resolve_ai.assistant import ResolveAssistant
-from resolve_ai.console_ui import ConsoleUI, launch_console_ui
+# Public names are imported from their submodule on first access (PEP 562),
+# so importing one light component doesn't pull in rich/requests/websocket.
+_LAZY_IMPORTS = {
+    "ResolveAIController": "resolve_ai.controller",
+    "get_controller": "resolve_ai.controller",
+    "FusionNodeBuilder": "resolve_ai.fusion_tools",
+    "CopilotCLI": "resolve_ai.copilot_cli",
+    "ComfyUIClient": "resolve_ai.comfyui_client",
+    "TaskRouter": "resolve_ai.task_router",
+    "ResolveAssistant": "resolve_ai.assistant",
+    "ConsoleUI": "resolve_ai.console_ui",
+    "launch_console_ui": "resolve_ai.console_ui",
+}
 
 __all__ = [
     "ResolveAIController",
+    "get_controller",
     "FusionNodeBuilder",
     "CopilotCLI",
     "ComfyUIClient",
@@ -25,3 +34,16 @@ __all__ = [
     "ConsoleUI",
     "launch_console_ui"
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -0,0 +1,17 @@
+"""
+Launcher entry point
+
+Run with `python -m resolve_ai._bootstrap` so the bootstrap is imported from
+cached bytecode instead of being re-parsed from a `-c` string on every launch.
+"""
+
+from resolve_ai.console_ui import launch_console_ui
+
+
+def main():
+    """Start the console UI"""
+    launch_console_ui()
+
+
+if __name__ == "__main__":
+    main()
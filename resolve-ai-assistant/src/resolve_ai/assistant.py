@@ -9,16 +9,44 @@ Architecture:
     All within 20-second iteration cycle
 """
 
+import os
 import time
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Optional, Dict, Any, List
+from dataclasses import dataclass, replace
 from enum import Enum
+from pathlib import Path
 
 from .controller import ResolveAIController
 from .fusion_tools import FusionNodeBuilder
 from .copilot_cli import CopilotCLI, CopilotSuggestion
-from .comfyui_client import ComfyUIClient, GenerationResult
-from .task_router import TaskRouter, RoutedTask, TaskType
+from .task_router import TaskRouter, RoutedTask
+from .semantic_cache import SemanticCache
+
+if TYPE_CHECKING:
+    # Imported lazily: requests/websocket are only needed when ComfyUI is used
+    from .comfyui_client import GenerationResult
+
+
+# Routed tasks and generated images are kept here between sessions
+CACHE_PATH = Path.home() / ".cache" / "resolve-ai" / "cache.db"
+
+# Fast ComfyUI settings that fit the 20-second iteration limit
+GENERATION_SETTINGS = {
+    'width': 512,   # Smaller for speed
+    'height': 512,
+    'steps': 15,    # Fewer steps for speed
+    'cfg': 7.0,
+}
+
+# Seconds each stage may take before it is reported as over budget
+STAGE_BUDGETS = {
+    'analyze': 3.0,
+    'route': 1.0,
+    'execute': 15.0,
+}
 
 
 class AssistantState(Enum):
@@ -44,12 +72,15 @@ class IterationResult:
     nodes_created: List[str] = None
     images_generated: List[str] = None
     error: Optional[str] = None
+    stage_times: Dict[str, float] = None  # Seconds spent per stage
     
     def __post_init__(self):
         if self.nodes_created is None:
             self.nodes_created = []
         if self.images_generated is None:
             self.images_generated = []
+        if self.stage_times is None:
+            self.stage_times = {}
 
 
 class ResolveAssistant:
@@ -64,6 +95,23 @@ class ResolveAssistant:
     5. Preview results
     """
     
+    # Node type -> builder call, taking (builder, params, name)
+    _NODE_BUILDERS = {
+        'background': lambda b, p, n: b.create_background_node(
+            color=p.get('color', (0.0, 0.0, 0.0, 1.0)), name=n
+        ),
+        'text': lambda b, p, n: b.create_text_node(
+            text=p.get('text', 'Text'),
+            color=p.get('color', (1.0, 1.0, 1.0)),
+            size=p.get('size', 0.1),
+            name=n
+        ),
+        'merge': lambda b, p, n: b.create_merge_node(name=n),
+        'transform': lambda b, p, n: b.create_transform_node(name=n),
+        'glow': lambda b, p, n: b.create_glow_node(name=n),
+        'blur': lambda b, p, n: b.create_blur_node(name=n),
+    }
+    
     def __init__(
         self,
         comfyui_url: str = "http://localhost:8188",
@@ -79,13 +127,17 @@ class ResolveAssistant:
         self.iteration_limit = iteration_limit
         self.state = AssistantState.IDLE
         
+        # Optional (step, total_steps, node) callback for ComfyUI sampler progress
+        self.on_progress: Optional[Callable[[int, int, Optional[str]], None]] = None
+        
         # Initialize components
         self.controller = ResolveAIController()
         self.copilot = CopilotCLI()
         
         # Try to initialize ComfyUI (optional)
         try:
-            self.comfyui = ComfyUIClient(comfyui_url)
+            from .comfyui_client import ComfyUIClient
+            self.comfyui = ComfyUIClient(comfyui_url, on_progress=self._report_progress)
             if not self.comfyui.check_connection():
                 print(f"⚠️  ComfyUI server not available at {comfyui_url}")
                 print("   AI image generation will be disabled")
@@ -95,11 +147,27 @@ class ResolveAssistant:
             print("   AI image generation will be disabled")
             self.comfyui = None
         
+        # Concurrent ComfyUI submissions; the server's queue is the real limit
+        self._generation_pool = ThreadPoolExecutor(
+            max_workers=max(1, int(os.getenv("COMFYUI_MAX_CONCURRENCY", "2"))),
+            thread_name_prefix="comfyui"
+        )
+        
         self.router = TaskRouter(self.copilot)
         
+        # Routed tasks and images for repeated requests (skips Copilot and ComfyUI)
+        self.cache = SemanticCache(max_entries=200, path=CACHE_PATH)
+        
+        # Recent (normalized input, finished at, result) for double-submit protection
+        self._recent: deque = deque(maxlen=8)
+        
+        # Recent durations per stage, for get_status()['stage_p95']
+        self._stage_history: Dict[str, deque] = {}
+        
         # Get Fusion composition
         self.comp = self.controller.get_fusion_comp()
         self.builder = FusionNodeBuilder(self.comp) if self.comp else None
+        self._builder_key = self.controller.fusion_comp_key
     
     def process_request(self, user_input: str) -> IterationResult:
         """
@@ -111,27 +179,54 @@ class ResolveAssistant:
         Returns:
             IterationResult with execution details
         """
-        start_time = time.time()
+        start_time = time.monotonic()
+        
+        # The same command again while the last one just finished is
+        # almost always a double submit, not a request for a second copy
+        key = self.cache.normalize(user_input)
+        window = min(self.iteration_limit, 30.0)
+        for recent_key, finished_at, recent_result in self._recent:
+            if recent_key == key and start_time - finished_at < window:
+                return replace(
+                    recent_result,
+                    duration=time.monotonic() - start_time,
+                    message=recent_result.message + " ⏩ debounced"
+                )
+        
+        stage_times: Dict[str, float] = {}
         
         try:
-            # Step 1: Analyze with Copilot CLI
-            self.state = AssistantState.ANALYZING
-            suggestion = self._analyze_input(user_input)
+            routed_task = self.cache.get(user_input)
+            cached = routed_task is not None
             
-            # Step 2: Route to appropriate system
-            self.state = AssistantState.ROUTING
-            routed_task = self._route_task(user_input, suggestion)
+            if not cached:
+                # Step 1: Analyze with Copilot CLI
+                self.state = AssistantState.ANALYZING
+                with self._timed('analyze', stage_times):
+                    suggestion = self._analyze_input(user_input)
+                
+                # Step 2: Route to appropriate system
+                self.state = AssistantState.ROUTING
+                with self._timed('route', stage_times):
+                    routed_task = self._route_task(user_input, suggestion)
+                self.cache.put(user_input, routed_task)
             
             # Step 3: Execute based on task type
-            if routed_task.task_type == TaskType.FUSION_ONLY:
-                result = self._execute_fusion_task(routed_task)
-            elif routed_task.task_type == TaskType.COMFYUI_ONLY:
-                result = self._execute_comfyui_task(routed_task)
-            else:  # HYBRID
-                result = self._execute_hybrid_task(routed_task)
+            with self._timed('execute', stage_times):
+                if routed_task.task_type == 'fusion':
+                    result = self._execute_fusion_task(routed_task)
+                elif routed_task.task_type == 'comfyui':
+                    result = self._execute_comfyui_task(routed_task)
+                else:  # hybrid
+                    result = self._execute_hybrid_task(routed_task)
+            
+            result.stage_times = stage_times
+            
+            if cached:
+                result.message += " ⏩ cached plan"
             
             # Calculate duration
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             result.duration = duration
             
             # Check 20-second limit
@@ -139,19 +234,59 @@ class ResolveAssistant:
                 result.message += f" ⚠️ Exceeded {self.iteration_limit}s limit ({duration:.1f}s)"
             
             self.state = AssistantState.COMPLETE
+            if result.success:
+                self._recent.append((key, time.monotonic(), result))
             return result
             
         except Exception as e:
             self.state = AssistantState.ERROR
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             return IterationResult(
                 success=False,
                 duration=duration,
                 state=AssistantState.ERROR,
                 message=f"Error processing request",
-                error=str(e)
+                error=str(e),
+                stage_times=stage_times
             )
     
+    @contextmanager
+    def _timed(self, stage: str, stage_times: Dict[str, float]):
+        """
+        Time a stage of process_request
+        
+        Records the duration into stage_times and the rolling history, and
+        warns when the stage goes over its STAGE_BUDGETS entry.
+        
+        Args:
+            stage: Stage name ('analyze', 'route', 'execute')
+            stage_times: Per-request dictionary to record into
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stage_times[stage] = elapsed
+            self._stage_history.setdefault(stage, deque(maxlen=50)).append(elapsed)
+            
+            budget = STAGE_BUDGETS.get(stage)
+            if budget is not None and elapsed > budget:
+                print(f"⚠️  Stage '{stage}' took {elapsed:.1f}s (budget {budget:.0f}s)")
+    
+    def _stage_p95(self) -> Dict[str, float]:
+        """95th percentile duration per stage over the recent history"""
+        p95 = {}
+        for stage, history in self._stage_history.items():
+            ordered = sorted(history)
+            p95[stage] = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return p95
+    
+    def _report_progress(self, value: int, total: int, node: Optional[str]) -> None:
+        """Forward ComfyUI progress to whoever is listening"""
+        if self.on_progress:
+            self.on_progress(value, total, node)
+    
     def _analyze_input(self, user_input: str) -> CopilotSuggestion:
         """
         Analyze user input with GitHub Copilot CLI
@@ -172,7 +307,7 @@ class ResolveAssistant:
         
         Keep it concise for 20-second execution."""
         
-        return self.copilot.suggest(prompt)
+        return self.copilot.suggest(prompt, raw_request=user_input)
     
     def _route_task(self, user_input: str, suggestion: CopilotSuggestion) -> RoutedTask:
         """
@@ -185,7 +320,7 @@ class ResolveAssistant:
         Returns:
             RoutedTask with execution plan
         """
-        return self.router.route(user_input)
+        return self.router.route(user_input, suggestion=suggestion)
     
     def _execute_fusion_task(self, task: RoutedTask) -> IterationResult:
         """
@@ -199,7 +334,7 @@ class ResolveAssistant:
         """
         self.state = AssistantState.EXECUTING_FUSION
         
-        if not self.builder:
+        if not self._ensure_builder():
             return IterationResult(
                 success=False,
                 duration=0,
@@ -211,10 +346,12 @@ class ResolveAssistant:
         nodes_created = []
         
         try:
-            for step in task.fusion_steps:
-                node = self._create_fusion_node(step)
-                if node:
-                    nodes_created.append(step.get('name', 'Unknown'))
+            # One undo entry and one repaint for the whole task
+            with self.builder.batch("AI Task"):
+                for step in task.fusion_steps:
+                    node = self._create_fusion_node(step)
+                    if node:
+                        nodes_created.append(step.get('name', 'Unknown'))
             
             return IterationResult(
                 success=True,
@@ -255,31 +392,18 @@ class ResolveAssistant:
                 error="ComfyUI server not connected. Start ComfyUI or use Fusion-only tasks."
             )
         
-        images_generated = []
-        
         try:
-            for prompt_data in task.comfyui_prompts:
-                prompt = prompt_data.get('prompt', '')
-                style = prompt_data.get('style', 'photorealistic')
-                
-                # Generate with fast settings for 20s limit
-                result = self.comfyui.generate(
-                    prompt=prompt,
-                    width=512,  # Smaller for speed
-                    height=512,
-                    steps=15,   # Fewer steps for speed
-                    cfg_scale=7.0,
-                    style=style
-                )
-                
-                if result.success:
-                    images_generated.append(result.image_path)
-                    
-                    # Import to Fusion if available
-                    if self.builder:
-                        loader = self.builder.create_loader_node(
-                            file_path=result.image_path,
-                            name=f"AI_{prompt_data.get('name', 'Generated')}"
+            futures = self._submit_generations(task.comfyui_prompts)
+            
+            images_generated = [result.image_path for result in self._collect_generations(futures)]
+            
+            # Import to Fusion if available
+            if self._ensure_builder():
+                with self.builder.batch("AI Task"):
+                    for i, image_path in enumerate(images_generated, 1):
+                        self.builder.create_loader_node(
+                            file_path=image_path,
+                            name=f"AI_Generated_{i}"
                         )
             
             return IterationResult(
@@ -325,29 +449,19 @@ class ResolveAssistant:
         nodes_created = []
         
         try:
-            # Step 1: Generate AI images
-            for prompt_data in task.comfyui_prompts:
-                prompt = prompt_data.get('prompt', '')
-                style = prompt_data.get('style', 'photorealistic')
-                
-                result = self.comfyui.generate(
-                    prompt=prompt,
-                    width=512,
-                    height=512,
-                    steps=15,
-                    cfg_scale=7.0,
-                    style=style
-                )
-                
-                if result.success:
-                    images_generated.append(result.image_path)
+            # Step 1: Start AI image generation in the background
+            futures = self._submit_generations(task.comfyui_prompts)
             
-            # Step 2: Create Fusion composition
-            if self.builder:
-                for step in task.fusion_steps:
-                    node = self._create_fusion_node(step)
-                    if node:
-                        nodes_created.append(step.get('name', 'Unknown'))
+            # Step 2: Create Fusion composition while ComfyUI works
+            if self._ensure_builder():
+                with self.builder.batch("AI Task"):
+                    for step in task.fusion_steps:
+                        node = self._create_fusion_node(step)
+                        if node:
+                            nodes_created.append(step.get('name', 'Unknown'))
+            
+            # Step 3: Wait for the generated images
+            images_generated = [result.image_path for result in self._collect_generations(futures)]
             
             return IterationResult(
                 success=True,
@@ -367,6 +481,70 @@ class ResolveAssistant:
                 error=str(e)
             )
     
+    def _submit_generations(self, prompts: List[str]) -> List[Future]:
+        """
+        Queue ComfyUI generations without waiting for them
+        
+        Prompts already generated with the same settings resolve immediately
+        to the cached image, and a prompt repeated within the list shares
+        the first occurrence's generation.
+        
+        Args:
+            prompts: Text prompts to generate
+            
+        Returns:
+            Futures resolving to GenerationResult, in prompt order
+        """
+        futures = []
+        submitted: Dict[str, Future] = {}
+        for prompt in prompts:
+            if prompt in submitted:
+                futures.append(submitted[prompt])
+                continue
+            
+            cached = self.cache.get_image(prompt, GENERATION_SETTINGS)
+            if cached is None:
+                future = self._generation_pool.submit(
+                    self.comfyui.generate, prompt=prompt, **GENERATION_SETTINGS
+                )
+            else:
+                from .comfyui_client import GenerationResult
+                
+                image_path, seed = cached
+                future = Future()
+                future.set_result(GenerationResult(
+                    image_path=image_path,
+                    prompt=prompt,
+                    seed=seed,
+                    steps=GENERATION_SETTINGS['steps'],
+                    generation_time=0.0
+                ))
+            
+            submitted[prompt] = future
+            futures.append(future)
+        return futures
+    
+    def _collect_generations(self, futures: List[Future]) -> List['GenerationResult']:
+        """
+        Wait for queued generations, skipping the ones that failed
+        
+        Args:
+            futures: Futures from _submit_generations
+            
+        Returns:
+            Successful GenerationResults, in prompt order
+        """
+        results = []
+        for future in futures:
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"⚠️  Generation failed: {e}")
+                continue
+            results.append(result)
+            self.cache.put_image(result.prompt, GENERATION_SETTINGS, result.image_path, result.seed)
+        return results
+    
     def _create_fusion_node(self, step: Dict[str, Any]) -> Optional[Any]:
         """
         Create a Fusion node based on step specification
@@ -380,42 +558,36 @@ class ResolveAssistant:
         node_type = step.get('type', '').lower()
         name = step.get('name', f"{node_type}_1")
         
+        create = self._NODE_BUILDERS.get(node_type)
+        if create is None:
+            print(f"Unknown node type: {node_type}")
+            return None
+        
+        # Router steps keep their settings under 'params'
+        params = {**step, **step.get('params', {})}
+        
         try:
-            if node_type == 'background':
-                color = step.get('color', (0.0, 0.0, 0.0, 1.0))
-                return self.builder.create_background_node(color=color, name=name)
-            
-            elif node_type == 'text':
-                text = step.get('text', 'Text')
-                color = step.get('color', (1.0, 1.0, 1.0))
-                size = step.get('size', 0.1)
-                return self.builder.create_text_node(
-                    text=text,
-                    color=color,
-                    size=size,
-                    name=name
-                )
-            
-            elif node_type == 'merge':
-                return self.builder.create_merge_node(name=name)
-            
-            elif node_type == 'transform':
-                return self.builder.create_transform_node(name=name)
-            
-            elif node_type == 'glow':
-                return self.builder.create_glow_node(name=name)
-            
-            elif node_type == 'blur':
-                return self.builder.create_blur_node(name=name)
-            
-            else:
-                print(f"Unknown node type: {node_type}")
-                return None
-                
+            return create(self.builder, params, name)
         except Exception as e:
             print(f"Failed to create {node_type} node: {e}")
             return None
     
+    def _ensure_builder(self) -> Optional[FusionNodeBuilder]:
+        """
+        Return the builder for the current Fusion comp
+        
+        The builder (and its node indexes) is only replaced when the comp's
+        key (selected item's unique id, comp index) changes, i.e. when
+        another clip is selected.
+        """
+        comp = self.controller.get_fusion_comp()
+        key = self.controller.fusion_comp_key
+        if key != self._builder_key:
+            self._builder_key = key
+            self.comp = comp
+            self.builder = FusionNodeBuilder(comp) if comp else None
+        return self.builder
+    
     def get_status(self) -> Dict[str, Any]:
         """
         Get current assistant status
@@ -429,7 +601,8 @@ class ResolveAssistant:
             'fusion_available': self.builder is not None,
             'comfyui_available': self.comfyui.check_connection() if self.comfyui else False,
             'copilot_available': self.copilot.check_available(),
-            'iteration_limit': self.iteration_limit
+            'iteration_limit': self.iteration_limit,
+            'stage_p95': self._stage_p95()
         }
     
     def clear_composition(self) -> bool:
@@ -439,7 +612,7 @@ class ResolveAssistant:
         Returns:
             True if successful
         """
-        if self.builder:
+        if self._ensure_builder():
             return self.builder.clear_composition()
         return False
 
@@ -5,14 +5,26 @@ Handles AI image generation via ComfyUI + Wan 2.2
 
 import requests
 import websocket
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import hashlib
 import json
+import logging
+import os
+import threading
 import uuid
 import time
 import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
+# Silent unless the application attaches a handler (ConsoleUI does)
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
 @dataclass
 class GenerationResult:
     """Result of ComfyUI generation"""
@@ -25,22 +37,82 @@ class GenerationResult:
 class ComfyUIClient:
     """Client for ComfyUI API with Wan 2.2 model"""
     
+    STATUS_TTL = 5.0  # Seconds a connection check result is reused
+    POLL_INTERVAL = 0.5  # Seconds between checks while waiting on a generation
+    WAIT_TIMEOUT = 300.0  # Seconds before giving up on a generation
+    RESULT_CACHE_SIZE = 64  # Generations remembered by generate()
+    BATCH_WORKERS = 4  # Generations generate_batch keeps in flight
+    HEALTH_TTL = 30.0  # Seconds a healthy server skips the startup probe
+    
+    # server_url -> monotonic time of the last healthy response, shared by all clients
+    _health_cache: Dict[str, float] = {}
+    
     def __init__(
         self,
         server_url: str = "http://localhost:8188",
-        wan22_model: str = "wan2.2.safetensors"
+        wan22_model: str = "wan2.2.safetensors",
+        on_progress: Optional[Callable[[int, int, Optional[str]], None]] = None
     ):
+        """
+        Initialize the client
+        
+        Args:
+            server_url: URL of ComfyUI server
+            wan22_model: Checkpoint file name
+            on_progress: Called as (step, total_steps, node) on each sampler progress event
+        """
         self.server_url = server_url.rstrip('/')
         self.wan22_model = wan22_model
+        self.on_progress = on_progress
         self.client_id = str(uuid.uuid4())
+        self._connection_ok = False
+        self._connection_checked_at: Optional[float] = None
+        
+        # One keep-alive connection pool for every request to the server
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update({'User-Agent': 'resolve-ai/0.2'})
+        
+        # One progress WebSocket per client, shared by concurrent generations
+        self._ws: Optional[websocket.WebSocket] = None
+        self._ws_lock = threading.Lock()
+        self._finished: set = set()  # Prompt ids seen completing on the WebSocket
+        
+        # Generations are deterministic per seed, so identical calls reuse the image
+        self._result_cache: "OrderedDict[tuple, GenerationResult]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        
+        # Only prompts, size and sampler settings change between generations
+        self._workflow_template = self._build_wan22_workflow(
+            prompt="",
+            negative_prompt="",
+            width=1920,
+            height=1080,
+            steps=20,
+            cfg=7.0,
+            seed=0
+        )
         
         self._check_server_available()
     
     def _check_server_available(self) -> bool:
         """Check if ComfyUI server is running"""
+        now = time.monotonic()
+        if now - self._health_cache.get(self.server_url, float('-inf')) < self.HEALTH_TTL:
+            self._connection_ok, self._connection_checked_at = True, now
+            return True
+        
         try:
-            response = requests.get(f"{self.server_url}/system_stats", timeout=5)
+            response = self._session.get(f"{self.server_url}/system_stats", timeout=5)
             if response.status_code == 200:
+                self._connection_ok, self._connection_checked_at = True, now
+                ComfyUIClient._health_cache[self.server_url] = now
                 return True
             raise RuntimeError("ComfyUI server not responding")
         except requests.exceptions.RequestException as e:
@@ -50,6 +122,45 @@ class ComfyUIClient:
                 "  python main.py --listen 0.0.0.0 --port 8188"
             ) from e
     
+    def check_connection(self) -> bool:
+        """
+        Check if ComfyUI server is reachable
+        
+        The result is reused for STATUS_TTL seconds so status polling
+        doesn't hit the server on every call.
+        
+        Returns:
+            True if the server responded, False otherwise
+        """
+        now = time.monotonic()
+        if self._connection_checked_at is not None and now - self._connection_checked_at < self.STATUS_TTL:
+            return self._connection_ok
+        
+        try:
+            response = self._session.get(f"{self.server_url}/system_stats", timeout=5)
+            ok = response.status_code == 200
+        except requests.exceptions.RequestException:
+            ok = False
+        
+        if ok:
+            ComfyUIClient._health_cache[self.server_url] = now
+        else:
+            ComfyUIClient._health_cache.pop(self.server_url, None)
+        self._connection_ok, self._connection_checked_at = ok, now
+        return ok
+    
+    def close(self) -> None:
+        """Close pooled connections to the server"""
+        with self._ws_lock:
+            self._drop_ws()
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
     def generate(
         self,
         prompt: str,
@@ -78,25 +189,40 @@ class ComfyUIClient:
         if seed is None:
             seed = int(time.time())
         
+        # Same inputs and seed give the same pixels, so reuse earlier output:
+        # first from memory, then from the content-addressed file on disk
+        cache_key = (prompt, negative_prompt, width, height, steps, cfg, seed)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            return cached
+        
+        output_path = self._output_path(cache_key)
+        if output_path.exists() and output_path.stat().st_size > 0:
+            result = GenerationResult(
+                image_path=str(output_path),
+                prompt=prompt,
+                seed=seed,
+                steps=steps,
+                generation_time=0.0
+            )
+            self._store_result(cache_key, result)
+            return result
+        
         # Build workflow
-        workflow = self._build_wan22_workflow(
-            prompt=prompt,
-            negative_prompt=negative_prompt,
-            width=width,
-            height=height,
-            steps=steps,
-            cfg=cfg,
-            seed=seed
-        )
+        workflow = self._patch_workflow({
+            "2": {"text": prompt},
+            "3": {"text": negative_prompt},
+            "4": {"width": width, "height": height},
+            "5": {"seed": seed, "steps": steps, "cfg": cfg},
+        })
         
-        start_time = time.time()
+        start_time = time.monotonic()
         
         # Submit workflow
-        print(f"🎨 Generating with Wan 2.2...")
-        print(f"   Prompt: {prompt}")
-        print(f"   Steps: {steps} (~{steps * 0.5:.0f}s estimated)")
+        logger.info("🎨 Generating with Wan 2.2: %s", prompt)
+        logger.debug("Steps: %d (~%.0fs estimated)", steps, steps * 0.5)
         
-        response = requests.post(
+        response = self._session.post(
             f"{self.server_url}/prompt",
             json={"prompt": workflow, "client_id": self.client_id}
         )
@@ -109,25 +235,58 @@ class ComfyUIClient:
         # Monitor progress
         self._monitor_progress(prompt_id)
         
-        # Get generated image
-        image_data = self._get_image(prompt_id)
-        
-        # Save to temp directory
-        output_path = Path(tempfile.gettempdir()) / f"comfyui_{prompt_id}.png"
-        with open(output_path, 'wb') as f:
-            f.write(image_data)
+        # Save generated image to temp directory
+        self._download_image(prompt_id, output_path)
         
-        generation_time = time.time() - start_time
+        generation_time = time.monotonic() - start_time
         
-        print(f"✅ Generated in {generation_time:.1f}s: {output_path}")
+        logger.info("✅ Generated in %.1fs: %s", generation_time, output_path)
         
-        return GenerationResult(
+        result = GenerationResult(
             image_path=str(output_path),
             prompt=prompt,
             seed=seed,
             steps=steps,
             generation_time=generation_time
         )
+        
+        self._store_result(cache_key, result)
+        return result
+    
+    def _output_path(self, key: tuple) -> Path:
+        """Temp file named by a hash of the generation inputs and model"""
+        digest = hashlib.blake2b(
+            json.dumps([*key, self.wan22_model]).encode(),
+            digest_size=16
+        ).hexdigest()
+        return Path(tempfile.gettempdir()) / f"comfyui_{digest}.png"
+    
+    def _store_result(self, key: tuple, result: GenerationResult) -> None:
+        """Remember a result in the in-memory LRU"""
+        with self._result_cache_lock:
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
+    def _cached_result(self, key: tuple) -> Optional[GenerationResult]:
+        """Return a cached generation whose image is still on disk"""
+        with self._result_cache_lock:
+            result = self._result_cache.get(key)
+            if result is None:
+                return None
+            if not os.path.exists(result.image_path):
+                del self._result_cache[key]
+                return None
+            self._result_cache.move_to_end(key)
+        
+        return GenerationResult(
+            image_path=result.image_path,
+            prompt=result.prompt,
+            seed=result.seed,
+            steps=result.steps,
+            generation_time=0.0
+        )
     
     def _build_wan22_workflow(
         self,
@@ -200,58 +359,127 @@ class ComfyUIClient:
             }
         }
     
-    def _monitor_progress(self, prompt_id: str) -> None:
-        """Monitor generation progress via WebSocket"""
-        try:
+    def _patch_workflow(self, inputs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Copy the workflow template with new inputs for some nodes
+        
+        Only the patched nodes are copied; the constant loader, decode and
+        save nodes are shared with the template.
+        
+        Args:
+            inputs: Node id -> input values to override
+        """
+        workflow = dict(self._workflow_template)
+        for node_id, values in inputs.items():
+            node = workflow[node_id]
+            workflow[node_id] = {**node, "inputs": {**node["inputs"], **values}}
+        return workflow
+    
+    def _connect_ws(self) -> "websocket.WebSocket":
+        """Return the shared WebSocket, (re)connecting if needed"""
+        if self._ws is None or not self._ws.connected:
             ws_url = self.server_url.replace('http://', 'ws://').replace('https://', 'wss://')
-            ws = websocket.create_connection(
+            self._ws = websocket.create_connection(
                 f"{ws_url}/ws?clientId={self.client_id}",
-                timeout=60
+                timeout=self.POLL_INTERVAL
             )
-            
-            last_node = None
-            
-            while True:
-                try:
-                    msg = ws.recv()
-                    if not msg:
+        return self._ws
+    
+    def _drop_ws(self) -> None:
+        """Close the shared WebSocket so the next wait reconnects"""
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
+    
+    def _monitor_progress(self, prompt_id: str) -> None:
+        """
+        Wait for a generation to finish, showing progress from the WebSocket
+        
+        One WebSocket is kept open for the client and shared by concurrent
+        waits: whichever thread holds the lock reads the next message and
+        records completions for every prompt, not just its own. Messages are
+        read with a short timeout; in the quiet gaps the history endpoint is
+        checked, so a prompt that finished before the socket connected
+        doesn't leave us waiting for messages that never come.
+        """
+        deadline = time.monotonic() + self.WAIT_TIMEOUT
+        
+        try:
+            while time.monotonic() < deadline:
+                with self._ws_lock:
+                    if prompt_id in self._finished:
                         break
                     
-                    data = json.loads(msg)
+                    try:
+                        msg = self._connect_ws().recv()
+                    except websocket.WebSocketTimeoutException:
+                        msg = None
                     
-                    if data.get("type") == "progress":
-                        # Show progress
-                        value = data["data"]["value"]
-                        max_val = data["data"]["max"]
-                        percentage = (value / max_val * 100) if max_val > 0 else 0
-                        print(f"   Progress: {percentage:.0f}%", end='\r')
-                    
-                    elif data.get("type") == "executing":
-                        node = data["data"].get("node")
-                        if node != last_node:
-                            if node:
-                                print(f"   Executing node: {node}")
-                            last_node = node
-                        
-                        # Check if completed
-                        if data["data"].get("prompt_id") == prompt_id and node is None:
-                            print("   Generation complete!")
-                            break
+                    if msg == "":
+                        raise ConnectionError("WebSocket closed by server")
+                    if isinstance(msg, str):
+                        self._handle_ws_message(json.loads(msg))
                 
-                except websocket.WebSocketTimeoutException:
+                if msg is None and self._is_finished(prompt_id):
                     break
-            
-            ws.close()
         
         except Exception as e:
-            print(f"   Warning: Could not monitor progress: {e}")
+            logger.warning("Lost progress connection: %s", e)
+            with self._ws_lock:
+                self._drop_ws()
             # Continue anyway - generation may still succeed
-            time.sleep(10)  # Estimate wait time
+            self._wait_for_history(prompt_id, deadline)
+        
+        with self._ws_lock:
+            self._finished.discard(prompt_id)
+    
+    def _handle_ws_message(self, data: Dict[str, Any]) -> None:
+        """Report progress and record completions from a WebSocket message"""
+        if data.get("type") == "progress":
+            value = data["data"]["value"]
+            max_val = data["data"]["max"]
+            
+            if self.on_progress:
+                self.on_progress(value, max_val, data["data"].get("node"))
+            logger.debug("Progress: %d/%d", value, max_val)
+        
+        elif data.get("type") == "executing":
+            node = data["data"].get("node")
+            if node:
+                logger.debug("Executing node: %s", node)
+            elif data["data"].get("prompt_id"):
+                # node None marks the end of that prompt's execution
+                logger.debug("Generation complete")
+                self._finished.add(data["data"]["prompt_id"])
+    
+    def _is_finished(self, prompt_id: str) -> bool:
+        """Check whether a prompt has reached the server's history"""
+        try:
+            response = self._session.get(f"{self.server_url}/history/{prompt_id}", timeout=5)
+            return response.status_code == 200 and prompt_id in response.json()
+        except (requests.exceptions.RequestException, ValueError):
+            return False
+    
+    def _wait_for_history(self, prompt_id: str, deadline: float) -> None:
+        """Poll the history endpoint until the prompt finishes or the deadline passes"""
+        while time.monotonic() < deadline:
+            if self._is_finished(prompt_id):
+                return
+            time.sleep(self.POLL_INTERVAL)
     
-    def _get_image(self, prompt_id: str) -> bytes:
-        """Get generated image from ComfyUI"""
+    def _download_image(self, prompt_id: str, output_path: Path) -> None:
+        """
+        Download the generated image from ComfyUI straight to disk
+        
+        The response is streamed in chunks and written to a temporary file
+        that is renamed into place, so a partial download never leaves a
+        truncated PNG at output_path.
+        """
         # Get history to find output filename
-        history_response = requests.get(
+        history_response = self._session.get(
             f"{self.server_url}/history/{prompt_id}"
         )
         
@@ -287,15 +515,17 @@ class ComfyUIClient:
             "type": folder_type
         }
         
-        image_response = requests.get(
-            f"{self.server_url}/view",
-            params=params
-        )
+        partial_path = output_path.with_name(output_path.name + ".part")
         
-        if image_response.status_code != 200:
-            raise RuntimeError("Failed to download image")
+        with self._session.get(f"{self.server_url}/view", params=params, stream=True) as image_response:
+            if image_response.status_code != 200:
+                raise RuntimeError("Failed to download image")
+            
+            with open(partial_path, 'wb') as f:
+                for chunk in image_response.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
         
-        return image_response.content
+        os.replace(partial_path, output_path)
     
     def generate_batch(
         self,
@@ -303,13 +533,26 @@ class ComfyUIClient:
         steps: int = 20,
         **kwargs
     ) -> List[GenerationResult]:
-        """Generate multiple images (for variations)"""
-        results = []
-        for i, prompt in enumerate(prompts):
-            print(f"\n🎨 Generating {i+1}/{len(prompts)}...")
-            result = self.generate(prompt, steps=steps, **kwargs)
-            results.append(result)
-        return results
+        """
+        Generate multiple images (for variations)
+        
+        Up to BATCH_WORKERS prompts are in flight at once, so the next
+        workflow is already queued on the server when one finishes.
+        Repeated prompts in one batch share a single generation.
+        """
+        unique = list(dict.fromkeys(prompts))
+        if not unique:
+            return []
+        
+        logger.info("🎨 Generating %d images...", len(unique))
+        with ThreadPoolExecutor(max_workers=min(len(unique), self.BATCH_WORKERS)) as pool:
+            futures = {
+                prompt: pool.submit(self.generate, prompt, steps=steps, **kwargs)
+                for prompt in unique
+            }
+            generated = {prompt: future.result() for prompt, future in futures.items()}
+        
+        return [generated[prompt] for prompt in prompts]
     
     def upscale(
         self,
@@ -324,13 +567,22 @@ class ComfyUIClient:
 
 # Helper functions for common use cases
 
+_default_client: Optional[ComfyUIClient] = None
+
+def _get_default_client() -> ComfyUIClient:
+    """Client shared by the helpers below when none is passed in"""
+    global _default_client
+    if _default_client is None:
+        _default_client = ComfyUIClient()
+    return _default_client
+
 def generate_background(
     prompt: str,
     client: Optional[ComfyUIClient] = None
 ) -> str:
     """Generate a background image"""
     if client is None:
-        client = ComfyUIClient()
+        client = _get_default_client()
     
     result = client.generate(
         prompt=prompt,
@@ -347,7 +599,7 @@ def generate_character(
 ) -> str:
     """Generate a character image"""
     if client is None:
-        client = ComfyUIClient()
+        client = _get_default_client()
     
     prompt = f"character portrait, {description}, professional lighting, detailed"
     
@@ -367,7 +619,7 @@ def generate_scene(
 ) -> str:
     """Generate a scene/environment"""
     if client is None:
-        client = ComfyUIClient()
+        client = _get_default_client()
     
     prompt = f"{style} scene, {description}, high quality, detailed"
     
@@ -5,8 +5,12 @@ Rich-formatted console interface for interacting with the AI assistant.
 Displays Copilot analysis, task routing, execution progress, and results.
 """
 
+import logging
 import sys
-from typing import Optional, List
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional
 from datetime import datetime
 
 from rich.console import Console
@@ -18,11 +22,22 @@ from rich.markdown import Markdown
 from rich.layout import Layout
 from rich.live import Live
 from rich.text import Text
+from rich.logging import RichHandler
 from rich import box
 
 from .assistant import ResolveAssistant, AssistantState, IterationResult
 
 
+# Inputs that end the session
+EXIT_COMMANDS = frozenset({'exit', 'quit', 'q', 'bye'})
+
+# Result panel (border style, title) by success
+RESULT_STYLES = {
+    True: ("green", "✓ Success"),
+    False: ("red", "✗ Error"),
+}
+
+
 class ConsoleUI:
     """
     Rich console interface for DaVinci Resolve AI Assistant
@@ -44,7 +59,23 @@ class ConsoleUI:
         """
         self.assistant = assistant
         self.console = Console()
-        self.history: List[IterationResult] = []
+        
+        # ComfyUI client logs go through the same console as the progress bar
+        comfyui_logger = logging.getLogger("resolve_ai.comfyui_client")
+        comfyui_logger.addHandler(RichHandler(console=self.console, show_path=False))
+        comfyui_logger.setLevel(logging.INFO)
+        self.history: deque = deque(maxlen=100)  # Most recent IterationResults
+        
+        # Special commands typed at the prompt
+        self._commands = {
+            'status': self.display_status,
+            'clear': self._clear_screen,
+            'history': self.display_history,
+            'help': self.display_help,
+        }
+        
+        # Requests run here so the main thread stays free for Ctrl-C
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assistant")
     
     def display_welcome(self):
         """Display welcome banner and system status"""
@@ -68,6 +99,11 @@ Powered by:
         # Display system status
         self.display_status()
     
+    def _clear_screen(self):
+        """Clear the console and show the welcome banner again"""
+        self.console.clear()
+        self.display_welcome()
+    
     def display_status(self):
         """Display current system status"""
         status = self.assistant.get_status()
@@ -115,26 +151,16 @@ Powered by:
                 default=""
             ).strip()
             
+            command = user_input.lower()
+            
             # Check for exit commands
-            if user_input.lower() in ['exit', 'quit', 'q', 'bye']:
+            if command in EXIT_COMMANDS:
                 return None
             
             # Check for special commands
-            if user_input.lower() == 'status':
-                self.display_status()
-                return ""
-            
-            if user_input.lower() == 'clear':
-                self.console.clear()
-                self.display_welcome()
-                return ""
-            
-            if user_input.lower() == 'history':
-                self.display_history()
-                return ""
-            
-            if user_input.lower() == 'help':
-                self.display_help()
+            handler = self._commands.get(command)
+            if handler:
+                handler()
                 return ""
             
             return user_input if user_input else ""
@@ -160,27 +186,39 @@ Powered by:
             console=self.console
         ) as progress:
             
-            # Create progress tasks
-            task = progress.add_task("[cyan]Processing request...", total=4)
-            
-            # Analyzing
-            progress.update(task, description="[cyan]Analyzing with Copilot CLI...")
-            progress.advance(task)
-            
-            # Routing
-            progress.update(task, description="[yellow]Routing task...")
-            progress.advance(task)
+            # Indeterminate until ComfyUI reports sampler steps
+            task = progress.add_task("[cyan]Processing request...", total=None)
             
-            # Executing
-            progress.update(task, description="[green]Executing...")
-            progress.advance(task)
+            def on_progress(value: int, total: int, node: Optional[str]):
+                progress.update(
+                    task,
+                    description="[magenta]Generating image...",
+                    completed=value,
+                    total=total
+                )
             
-            # Actually process the request
-            result = self.assistant.process_request(user_input)
+            self.assistant.on_progress = on_progress
+            future = self._worker.submit(self.assistant.process_request, user_input)
+            try:
+                # Short waits so KeyboardInterrupt is delivered promptly (Windows too)
+                while not wait([future], timeout=0.1).done:
+                    pass
+                result = future.result()
+            except KeyboardInterrupt:
+                future.cancel()
+                progress.update(task, description="[yellow]Cancelled", total=1, completed=0)
+                return IterationResult(
+                    success=False,
+                    duration=0,
+                    state=AssistantState.ERROR,
+                    message="Cancelled",
+                    error="Steps already sent to Resolve/ComfyUI finish in the background"
+                )
+            finally:
+                self.assistant.on_progress = None
             
             # Complete
-            progress.update(task, description="[bold green]Complete!")
-            progress.advance(task)
+            progress.update(task, description="[bold green]Complete!", total=1, completed=1)
         
         return result
     
@@ -192,12 +230,7 @@ Powered by:
             result: IterationResult to display
         """
         # Determine panel style based on success
-        if result.success:
-            border_style = "green"
-            title = "✓ Success"
-        else:
-            border_style = "red"
-            title = "✗ Error"
+        border_style, title = RESULT_STYLES[result.success]
         
         # Build result content
         content = Text()
@@ -213,14 +246,12 @@ Powered by:
         # Show created nodes
         if result.nodes_created:
             content.append(f"\nFusion Nodes Created: {len(result.nodes_created)}\n", style="blue bold")
-            for node in result.nodes_created:
-                content.append(f"  • {node}\n", style="blue")
+            content.append("".join(f"  • {node}\n" for node in result.nodes_created), style="blue")
         
         # Show generated images
         if result.images_generated:
             content.append(f"\nAI Images Generated: {len(result.images_generated)}\n", style="magenta bold")
-            for img in result.images_generated:
-                content.append(f"  • {img}\n", style="magenta")
+            content.append("".join(f"  • {img}\n" for img in result.images_generated), style="magenta")
         
         # Show error if any
         if result.error:
@@ -244,9 +275,11 @@ Powered by:
         table.add_column("#", style="cyan", width=4)
         table.add_column("Status", style="bold", width=8)
         table.add_column("Duration", style="blue", width=10)
-        table.add_column("Message", style="white")
+        # Rich truncates long messages with an ellipsis at render time
+        table.add_column("Message", style="white", max_width=53, overflow="ellipsis", no_wrap=True)
         
-        for i, result in enumerate(self.history[-10:], 1):  # Last 10 results
+        recent = islice(self.history, max(0, len(self.history) - 10), None)  # Last 10 results
+        for i, result in enumerate(recent, 1):
             status = "✓" if result.success else "✗"
             status_color = "green" if result.success else "red"
             duration = f"{result.duration:.2f}s"
@@ -255,7 +288,7 @@ Powered by:
                 str(i),
                 f"[{status_color}]{status}[/]",
                 duration,
-                result.message[:50] + "..." if len(result.message) > 50 else result.message
+                result.message
             )
         
         self.console.print(table)
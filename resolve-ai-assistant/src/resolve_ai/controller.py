@@ -5,6 +5,8 @@ Provides high-level interface for AI to control Resolve and Fusion
 
 import sys
 import os
+import time
+from functools import lru_cache
 from typing import Optional, Dict, List, Any
 from pathlib import Path
 import json
@@ -13,8 +15,49 @@ import json
 class ResolveAIController:
     """Main controller for AI-driven DaVinci Resolve automation"""
 
-    def __init__(self):
-        """Initialize connection to DaVinci Resolve"""
+    TIMELINE_TTL = 0.1  # Seconds the current timeline handle and name are reused
+    SETTINGS_TTL = 1.0  # Seconds timeline settings are reused
+
+    # Set by connect(); reading one before that connects on demand
+    _LAZY_ATTRIBUTES = frozenset({'resolve', 'project_manager', 'project', 'fusion'})
+
+    def __init__(self, connect: bool = True):
+        """
+        Initialize connection to DaVinci Resolve
+        
+        Args:
+            connect: Connect now, raising RuntimeError if Resolve isn't running
+                with a project open. With False, connecting is deferred until
+                resolve, project_manager, project or fusion is first used (or
+                connect() is called), and that first use raises instead.
+        """
+        self._connected = False
+        
+        # Last Fusion comp and its (timeline item unique id, comp index)
+        self._fusion_comp = None
+        self._fusion_comp_key: Optional[tuple] = None
+        
+        # Short-lived copies of Resolve lookups: key -> (value, expiry)
+        self._cache: Dict[Any, tuple] = {}
+        
+        # Timeline name -> index, built on first lookup by name
+        self._timeline_index: Optional[Dict[str, int]] = None
+        
+        if connect:
+            self.connect()
+
+    def __getattr__(self, name: str):
+        # Only reached for attributes that aren't set yet, i.e. before connect()
+        if name in self._LAZY_ATTRIBUTES and not self.__dict__.get('_connected'):
+            self.connect()
+            return getattr(self, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def connect(self):
+        """Import DaVinciResolveScript and connect to the running Resolve"""
+        if self._connected:
+            return
+        
         self.resolve = None
         self.project_manager = None
         self.project = None
@@ -25,6 +68,7 @@ class ResolveAIController:
         
         # Connect to Resolve
         self._connect_to_resolve()
+        self._connected = True
 
     def _import_resolve_module(self):
         """Import DaVinciResolveScript module"""
@@ -81,31 +125,86 @@ class ResolveAIController:
         Returns:
             True if connected, False otherwise
         """
+        try:
+            self.connect()
+        except RuntimeError:
+            return False
         return self.resolve is not None and self.project is not None
     
+    def _cached(self, key: Any, ttl: float, fn):
+        """
+        Return a cached value, calling fn() to refresh it once ttl has passed
+        
+        Every Resolve API call is a round trip to the Resolve process, so
+        values read repeatedly within a short window are kept locally.
+        """
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        
+        value = fn()
+        self._cache[key] = (value, now + ttl)
+        return value
+    
+    def invalidate_cache(self):
+        """Forget cached timeline handles, settings and the timeline name index"""
+        self._cache.clear()
+        self._timeline_index = None
+    
     def get_project_info(self) -> Dict[str, Any]:
         """Get information about current project"""
         if not self.project:
             return {"error": "No project open"}
         
-        timeline = self.project.GetCurrentTimeline()
+        timeline = self.get_current_timeline()
+        if not timeline:
+            return {
+                "project_name": self.project.GetName(),
+                "current_timeline": None,
+                "timeline_count": self.project.GetTimelineCount(),
+                "frame_rate": None,
+                "resolution": {"width": None, "height": None}
+            }
+        
+        timeline_name = self._cached("timeline_name", self.TIMELINE_TTL, timeline.GetName)
+        
+        settings = self._cached(
+            ("settings", timeline_name),
+            self.SETTINGS_TTL,
+            lambda: self._read_timeline_settings(timeline)
+        )
         
         return {
             "project_name": self.project.GetName(),
-            "current_timeline": timeline.GetName() if timeline else None,
+            "current_timeline": timeline_name,
             "timeline_count": self.project.GetTimelineCount(),
-            "frame_rate": timeline.GetSetting("timelineFrameRate") if timeline else None,
+            "frame_rate": settings.get("timelineFrameRate"),
             "resolution": {
-                "width": timeline.GetSetting("timelineResolutionWidth") if timeline else None,
-                "height": timeline.GetSetting("timelineResolutionHeight") if timeline else None,
+                "width": settings.get("timelineResolutionWidth"),
+                "height": settings.get("timelineResolutionHeight"),
             }
         }
 
+    @staticmethod
+    def _read_timeline_settings(timeline) -> Dict[str, Any]:
+        """Read timeline settings, in one call where Resolve supports it"""
+        # GetSetting("") returns every timeline setting as a dict
+        settings = timeline.GetSetting("")
+        if isinstance(settings, dict) and settings:
+            return settings
+        
+        # Older Resolve versions only answer per-key queries
+        return {
+            key: timeline.GetSetting(key)
+            for key in ("timelineFrameRate", "timelineResolutionWidth", "timelineResolutionHeight")
+        }
+
     def get_current_timeline(self):
-        """Get current timeline object"""
+        """Get current timeline object (reused for TIMELINE_TTL seconds)"""
         if not self.project:
             return None
-        return self.project.GetCurrentTimeline()
+        return self._cached("timeline", self.TIMELINE_TTL, self.project.GetCurrentTimeline)
 
     def get_fusion_comp(self) -> Optional[object]:
         """
@@ -113,36 +212,67 @@ class ResolveAIController:
         Returns Fusion comp from current timeline's selected clip
         """
         timeline = self.get_current_timeline()
-        if not timeline:
-            return None
-        
-        # Get currently selected clip
-        current_video_item = timeline.GetCurrentVideoItem()
+        current_video_item = timeline.GetCurrentVideoItem() if timeline else None
         if not current_video_item:
+            self._fusion_comp = None
+            self._fusion_comp_key = None
             return None
         
+        # Reuse the comp while the same clip stays selected. Proxies for the
+        # same item need not compare equal, so compare the item's unique id.
+        key = (current_video_item.GetUniqueId(), 1)
+        if self._fusion_comp is not None and key == self._fusion_comp_key:
+            return self._fusion_comp
+        
         # Get Fusion composition from clip
         fusion_comp = current_video_item.GetFusionCompByIndex(1)
+        self._fusion_comp = fusion_comp
+        self._fusion_comp_key = key if fusion_comp else None
         return fusion_comp
 
+    @property
+    def fusion_comp_key(self) -> Optional[tuple]:
+        """(timeline item unique id, comp index) of the comp get_fusion_comp() last returned"""
+        return self._fusion_comp_key
+
+    @staticmethod
+    def _item_info(item) -> Dict[str, Any]:
+        """Summarize a timeline item"""
+        return {
+            "name": item.GetName(),
+            "duration": item.GetDuration(),
+            "start": item.GetStart(),
+            "end": item.GetEnd(),
+        }
+
     def list_timeline_items(self) -> List[Dict[str, Any]]:
         """List all items in current timeline"""
         timeline = self.get_current_timeline()
         if not timeline:
             return []
         
-        items = []
-        item_count = timeline.GetItemListInTrack("video", 1)
+        return [self._item_info(item) for item in timeline.GetItemListInTrack("video", 1) or []]
+
+    def list_timeline_items_all_tracks(self, track_type: str = "video") -> List[Dict[str, Any]]:
+        """
+        List items on every track of the current timeline
         
-        for item in item_count:
-            items.append({
-                "name": item.GetName(),
-                "duration": item.GetDuration(),
-                "start": item.GetStart(),
-                "end": item.GetEnd(),
-            })
+        Args:
+            track_type: "video", "audio" or "subtitle"
         
-        return items
+        Returns:
+            Item dicts (as list_timeline_items) with a "track" index, in track order
+        """
+        timeline = self.get_current_timeline()
+        if not timeline:
+            return []
+        
+        track_count = timeline.GetTrackCount(track_type) or 0
+        return [
+            {**self._item_info(item), "track": track}
+            for track in range(1, track_count + 1)
+            for item in timeline.GetItemListInTrack(track_type, track) or []
+        ]
 
     def add_marker(
         self,
@@ -174,6 +304,35 @@ class ResolveAIController:
             duration
         )
 
+    def add_markers(self, markers: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Add several markers to the current timeline
+        
+        The timeline is looked up once for the whole batch instead of once
+        per marker.
+        
+        Args:
+            markers: List of dicts with add_marker() keyword arguments
+                (frame_id, and optionally color, name, note, duration)
+        
+        Returns:
+            Success flag for each marker, in order
+        """
+        timeline = self.get_current_timeline()
+        if not timeline:
+            return [False] * len(markers)
+        
+        return [
+            bool(timeline.AddMarker(
+                marker["frame_id"],
+                marker.get("color", "Blue"),
+                marker.get("name", ""),
+                marker.get("note", ""),
+                marker.get("duration", 1)
+            ))
+            for marker in markers
+        ]
+
     def create_timeline(
         self,
         name: str,
@@ -199,23 +358,39 @@ class ResolveAIController:
         
         timeline = media_pool.CreateEmptyTimeline(name)
         if timeline:
-            # Apply settings
+            # Apply settings (SetSetting takes one key/value pair per call)
             for key, value in timeline_settings.items():
                 if key != "name":
                     timeline.SetSetting(key, value)
+            self.invalidate_cache()
             return True
         
         return False
 
+    def _timeline_map(self) -> Dict[str, int]:
+        """Map timeline names to their 1-based index, building it on first use"""
+        if self._timeline_index is None:
+            self._timeline_index = {}
+            for i in range(1, self.project.GetTimelineCount() + 1):
+                timeline = self.project.GetTimelineByIndex(i)
+                if timeline:
+                    self._timeline_index.setdefault(timeline.GetName(), i)
+        return self._timeline_index
+
     def set_current_timeline(self, timeline_name: str) -> bool:
         """Set timeline as current by name"""
-        timeline_count = self.project.GetTimelineCount()
-        
-        for i in range(1, timeline_count + 1):
-            timeline = self.project.GetTimelineByIndex(i)
+        for _ in range(2):
+            index = self._timeline_map().get(timeline_name)
+            timeline = self.project.GetTimelineByIndex(index) if index else None
+            
+            # Timelines can be added, renamed or removed in Resolve itself;
+            # rebuild the index once if it no longer matches
             if timeline and timeline.GetName() == timeline_name:
                 self.project.SetCurrentTimeline(timeline)
+                self._cache.pop("timeline", None)
+                self._cache.pop("timeline_name", None)
                 return True
+            self._timeline_index = None
         
         return False
 
@@ -241,9 +416,10 @@ class ResolveAIController:
         self.project.LoadRenderPreset(preset_name)
         
         # Set output path
+        output = Path(output_path)
         self.project.SetRenderSettings({
-            "TargetDir": str(Path(output_path).parent),
-            "CustomName": Path(output_path).stem
+            "TargetDir": str(output.parent),
+            "CustomName": output.stem
         })
         
         # Add to render queue
@@ -262,14 +438,14 @@ class ResolveAIController:
         root_folder = media_pool.GetRootFolder()
         
         items = []
-        clips = root_folder.GetClipList()
-        
-        for clip in clips:
+        for clip in root_folder.GetClipList() or []:
+            # One call returns every clip property
+            props = clip.GetClipProperty() or {}
             items.append({
-                "name": clip.GetName(),
-                "duration": clip.GetClipProperty("Duration"),
-                "fps": clip.GetClipProperty("FPS"),
-                "resolution": f"{clip.GetClipProperty('Resolution Width')}x{clip.GetClipProperty('Resolution Height')}",
+                "name": props.get("Clip Name") or clip.GetName(),
+                "duration": props.get("Duration"),
+                "fps": props.get("FPS"),
+                "resolution": f"{props.get('Resolution Width')}x{props.get('Resolution Height')}",
             })
         
         return items
@@ -281,18 +457,36 @@ class ResolveAIController:
         Args:
             file_paths: List of file paths to import
         """
-        media_pool = self.project.GetMediaPool()
         media_storage = self.resolve.GetMediaStorage()
         
-        # Add clips to media pool
-        result = media_storage.AddItemListToMediaPool(file_paths)
+        # One call for all files: each call is a round trip to Resolve
+        result = media_storage.AddItemListToMediaPool(list(file_paths))
         return bool(result)
 
     def get_status(self) -> Dict[str, Any]:
         """Get comprehensive status of Resolve connection"""
+        try:
+            self.connect()
+        except RuntimeError:
+            pass
+        
+        # Read without __getattr__, which would retry a failed connect
+        project = self.__dict__.get("project")
         return {
-            "connected": self.resolve is not None,
-            "project_open": self.project is not None,
-            "project_info": self.get_project_info() if self.project else None,
-            "fusion_available": self.fusion is not None,
+            "connected": self.__dict__.get("resolve") is not None,
+            "project_open": project is not None,
+            "project_info": self.get_project_info() if project else None,
+            "fusion_available": self.__dict__.get("fusion") is not None,
         }
+
+
+@lru_cache(maxsize=1)
+def get_controller() -> ResolveAIController:
+    """
+    Shared controller, connected on first call
+    
+    Scripts that run several actions reuse one Resolve connection instead of
+    redoing the handshake for each. A failed connect raises and isn't cached;
+    call get_controller.cache_clear() to reconnect after Resolve restarts.
+    """
+    return ResolveAIController()
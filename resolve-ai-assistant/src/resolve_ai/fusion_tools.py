@@ -3,13 +3,62 @@ Fusion Node Builder
 Provides tools for creating and manipulating Fusion nodes programmatically
 """
 
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional, Tuple
 import json
 
 
+@dataclass
+class NodeSpec:
+    """Declarative description of a single node"""
+    kind: str  # Builder helper: background, text, transform, merge, glow, ...
+    name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class GraphSpec:
+    """Declarative node graph, built in pure Python and created in one batch"""
+    nodes: List[NodeSpec] = field(default_factory=list)
+    edges: List[Tuple[str, str, str]] = field(default_factory=list)  # (source, target, input)
+
+    def add(self, kind: str, name: str, **params) -> str:
+        """Add a node and return its name for use in connect()"""
+        self.nodes.append(NodeSpec(kind, name, params))
+        return name
+
+    def connect(self, source: str, target: str, input_name: str = "Input") -> None:
+        """Connect source output to target input"""
+        self.edges.append((source, target, input_name))
+
+
+# build_lower_third() result keys -> node names
+LOWER_THIRD_NODES = {
+    "background": "LowerThird_BG",
+    "bg_transform": "LowerThird_Transform",
+    "title": "LowerThird_Title",
+    "title_merge": "LowerThird_TitleMerge",
+    "subtitle": "LowerThird_Subtitle",
+    "subtitle_merge": "LowerThird_SubtitleMerge",
+}
+
+
 class FusionNodeBuilder:
     """Builder for creating and connecting Fusion nodes"""
 
+    # NodeSpec.kind -> builder method
+    _CREATORS = {
+        "background": "create_background_node",
+        "text": "create_text_node",
+        "transform": "create_transform_node",
+        "merge": "create_merge_node",
+        "color_corrector": "create_color_corrector",
+        "blur": "create_blur_node",
+        "glow": "create_glow_node",
+        "loader": "create_loader_node",
+    }
+
     def __init__(self, comp):
         """
         Initialize with Fusion composition
@@ -18,34 +67,96 @@ class FusionNodeBuilder:
             comp: Fusion composition object from timeline clip
         """
         self.comp = comp
-        self.created_nodes = {}  # Track created nodes by name
+        self.created_nodes = {}  # Track nodes created with a custom name
+        self._by_type = None  # Lazily built index of comp tools by TOOLS_RegID
+        self._name_index = {}  # Comp tools by TOOLS_Name, refreshed on a lookup miss
+        self._batch_depth = 0  # Nesting level of batch() blocks
+
+    @contextmanager
+    def batch(self, undo_name: str = "batch"):
+        """
+        Group node creation and connection into a single Fusion transaction
+        
+        Locks the composition and wraps everything in one undo step so Fusion
+        doesn't redraw or record history after every individual call.
+        Nested batches join the outermost one.
+        
+        Args:
+            undo_name: Name of the undo step shown in Fusion
+        """
+        if not self.comp or self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+        
+        self._batch_depth = 1
+        self.comp.Lock()
+        self.comp.StartUndo(undo_name)
+        try:
+            yield self
+        finally:
+            self.comp.EndUndo(True)
+            self.comp.Unlock()
+            self._batch_depth = 0
 
     def get_node_list(self) -> List[str]:
         """Get list of all nodes in composition"""
         if not self.comp:
             return []
         
-        tools = self.comp.GetToolList()
-        return [tool.GetAttrs()["TOOLS_Name"] for tool in tools.values()]
+        # Same single pass refreshes the name index for later lookups
+        self._index_tools()
+        return list(self._name_index)
 
     def get_node_by_name(self, name: str):
         """Find node by name"""
         if not self.comp:
             return None
         
-        tools = self.comp.GetToolList()
-        for tool in tools.values():
-            if tool.GetAttrs()["TOOLS_Name"] == name:
-                return tool
+        tool = self._name_index.get(name)
+        if tool is None:
+            # Unknown name: the comp may have changed outside this builder
+            self._index_tools()
+            tool = self._name_index.get(name)
         
-        return None
+        return tool
+
+    def _index_tools(self):
+        """Read every tool's attributes once, indexing them by name and by type"""
+        self._name_index = {}
+        self._by_type = {}
+        if self.comp:
+            for tool in self.comp.GetToolList(False).values():
+                attrs = tool.GetAttrs()
+                self._name_index[attrs["TOOLS_Name"]] = tool
+                self._by_type.setdefault(attrs["TOOLS_RegID"], []).append(tool)
+
+    def _type_index(self) -> Dict[str, List[object]]:
+        """Build (once) an index of composition tools grouped by type"""
+        if self._by_type is None:
+            self._index_tools()
+        return self._by_type
+
+    def first_of_type(self, node_type: str) -> Optional[object]:
+        """
+        Find the first node of a given type (e.g. "MediaIn")
+        
+        Args:
+            node_type: Fusion tool registry ID
+        """
+        nodes = self._type_index().get(node_type)
+        return nodes[0] if nodes else None
 
     def create_node(
         self,
         node_type: str,
         name: Optional[str] = None,
         x_pos: int = 0,
-        y_pos: int = 0
+        y_pos: int = 0,
+        initial_params: Optional[Dict[str, Any]] = None
     ) -> Optional[object]:
         """
         Create a new Fusion node
@@ -68,24 +179,27 @@ class FusionNodeBuilder:
             name: Optional custom name
             x_pos: X position in flow
             y_pos: Y position in flow
+            initial_params: Inputs to set on the new node
         """
         if not self.comp:
             return None
         
         try:
-            tool = self.comp.AddTool(node_type)
+            # AddTool places the node at the given flow position itself
+            tool = self.comp.AddTool(node_type, x_pos, y_pos)
             
             if tool:
-                # Set position
-                tool.SetAttrs({"TOOLB_XPos": x_pos, "TOOLB_YPos": y_pos})
+                self._by_type = None
                 
-                # Set custom name if provided
+                # Default names aren't read here; get_node_by_name picks them
+                # up from the tool list when first asked for
                 if name:
                     tool.SetAttrs({"TOOLS_Name": name})
                     self.created_nodes[name] = tool
-                else:
-                    default_name = tool.GetAttrs()["TOOLS_Name"]
-                    self.created_nodes[default_name] = tool
+                    self._name_index[name] = tool
+                
+                if initial_params:
+                    self.set_node_params(tool, initial_params)
                 
                 return tool
             
@@ -130,6 +244,30 @@ class FusionNodeBuilder:
             print(f"Error connecting nodes: {e}")
             return False
 
+    def connect_many(self, edges: List[Tuple[Any, Any, str]], undo_name: str = "Connect") -> int:
+        """
+        Make several connections in one Fusion transaction
+        
+        Edges are grouped by target so each target's inputs are wired back to
+        back, and the composition is locked once for the whole set.
+        
+        Args:
+            edges: (source, target, input_name) tuples; nodes may be objects or names
+            undo_name: Name of the undo step shown in Fusion
+        
+        Returns number of connections made
+        """
+        by_target: Dict[Any, List[Tuple[str, Any]]] = {}
+        for source, target, input_name in edges:
+            by_target.setdefault(target, []).append((input_name, source))
+        
+        connected = 0
+        with self.batch(undo_name):
+            for target, inputs in by_target.items():
+                for input_name, source in inputs:
+                    connected += self.connect_nodes(source, target, input_name=input_name)
+        return connected
+
     def set_node_params(self, node, params: Dict[str, Any]) -> bool:
         """
         Set parameters on a node
@@ -163,19 +301,20 @@ class FusionNodeBuilder:
         y_pos: int = 0
     ) -> Optional[object]:
         """Create a text node with specified parameters"""
-        node = self.create_node("Text+", name=name, x_pos=x_pos, y_pos=y_pos)
-        
-        if node:
-            self.set_node_params(node, {
+        return self.create_node(
+            "Text+",
+            name=name,
+            x_pos=x_pos,
+            y_pos=y_pos,
+            initial_params={
                 "StyledText": text,
                 "Font": font,
                 "Size": size,
                 "Red": color[0],
                 "Green": color[1],
                 "Blue": color[2],
-            })
-        
-        return node
+            }
+        )
 
     def create_background_node(
         self,
@@ -185,17 +324,18 @@ class FusionNodeBuilder:
         y_pos: int = 0
     ) -> Optional[object]:
         """Create a background node with specified color"""
-        node = self.create_node("Background", name=name, x_pos=x_pos, y_pos=y_pos)
-        
-        if node:
-            self.set_node_params(node, {
+        return self.create_node(
+            "Background",
+            name=name,
+            x_pos=x_pos,
+            y_pos=y_pos,
+            initial_params={
                 "TopLeftRed": color[0],
                 "TopLeftGreen": color[1],
                 "TopLeftBlue": color[2],
                 "TopLeftAlpha": color[3],
-            })
-        
-        return node
+            }
+        )
 
     def create_transform_node(
         self,
@@ -207,16 +347,17 @@ class FusionNodeBuilder:
         y_pos: int = 0
     ) -> Optional[object]:
         """Create a transform node"""
-        node = self.create_node("Transform", name=name, x_pos=x_pos, y_pos=y_pos)
-        
-        if node:
-            self.set_node_params(node, {
+        return self.create_node(
+            "Transform",
+            name=name,
+            x_pos=x_pos,
+            y_pos=y_pos,
+            initial_params={
                 "Center": center,
                 "Size": size,
                 "Angle": angle,
-            })
-        
-        return node
+            }
+        )
 
     def create_merge_node(
         self,
@@ -227,14 +368,15 @@ class FusionNodeBuilder:
         y_pos: int = 0
     ) -> Optional[object]:
         """Create a merge node for compositing"""
-        node = self.create_node("Merge", name=name, x_pos=x_pos, y_pos=y_pos)
-        
-        if node:
-            self.set_node_params(node, {
+        return self.create_node(
+            "Merge",
+            name=name,
+            x_pos=x_pos,
+            y_pos=y_pos,
+            initial_params={
                 "Blend": opacity,
-            })
-        
-        return node
+            }
+        )
 
     def create_color_corrector(
         self,
@@ -246,10 +388,12 @@ class FusionNodeBuilder:
         y_pos: int = 0
     ) -> Optional[object]:
         """Create a color corrector node"""
-        node = self.create_node("ColorCorrector", name=name, x_pos=x_pos, y_pos=y_pos)
-        
-        if node:
-            self.set_node_params(node, {
+        return self.create_node(
+            "ColorCorrector",
+            name=name,
+            x_pos=x_pos,
+            y_pos=y_pos,
+            initial_params={
                 "GainRed": gain[0],
                 "GainGreen": gain[1],
                 "GainBlue": gain[2],
@@ -258,9 +402,8 @@ class FusionNodeBuilder:
                 "GammaGreen": gamma[1],
                 "GammaBlue": gamma[2],
                 "GammaAlpha": gamma[3],
-            })
-        
-        return node
+            }
+        )
 
     def create_blur_node(
         self,
@@ -270,14 +413,15 @@ class FusionNodeBuilder:
         y_pos: int = 0
     ) -> Optional[object]:
         """Create a blur node"""
-        node = self.create_node("Blur", name=name, x_pos=x_pos, y_pos=y_pos)
-        
-        if node:
-            self.set_node_params(node, {
+        return self.create_node(
+            "Blur",
+            name=name,
+            x_pos=x_pos,
+            y_pos=y_pos,
+            initial_params={
                 "XBlurSize": blur_size,
-            })
-        
-        return node
+            }
+        )
 
     def create_glow_node(
         self,
@@ -288,15 +432,16 @@ class FusionNodeBuilder:
         y_pos: int = 0
     ) -> Optional[object]:
         """Create a glow node"""
-        node = self.create_node("Glow", name=name, x_pos=x_pos, y_pos=y_pos)
-        
-        if node:
-            self.set_node_params(node, {
+        return self.create_node(
+            "Glow",
+            name=name,
+            x_pos=x_pos,
+            y_pos=y_pos,
+            initial_params={
                 "GlowSize": glow_size,
                 "Gain": gain,
-            })
-        
-        return node
+            }
+        )
 
     def create_loader_node(
         self,
@@ -306,14 +451,15 @@ class FusionNodeBuilder:
         y_pos: int = 0
     ) -> Optional[object]:
         """Create a loader node to import media"""
-        node = self.create_node("Loader", name=name, x_pos=x_pos, y_pos=y_pos)
-        
-        if node:
-            self.set_node_params(node, {
+        return self.create_node(
+            "Loader",
+            name=name,
+            x_pos=x_pos,
+            y_pos=y_pos,
+            initial_params={
                 "Clip": file_path,
-            })
-        
-        return node
+            }
+        )
 
     def build_lower_third(
         self,
@@ -327,67 +473,126 @@ class FusionNodeBuilder:
         
         Returns dictionary of created nodes
         """
-        nodes = {}
-        
-        # Create background
-        nodes["background"] = self.create_background_node(
-            color=bg_color,
-            name="LowerThird_BG",
-            x_pos=0,
-            y_pos=0
-        )
+        spec = GraphSpec()
         
-        # Transform background to lower third position
-        nodes["bg_transform"] = self.create_transform_node(
-            name="LowerThird_Transform",
-            center=(0.5, 0.15),
-            size=0.4,
-            x_pos=1,
-            y_pos=0
-        )
-        
-        # Connect background to transform
-        self.connect_nodes(nodes["background"], nodes["bg_transform"])
-        
-        # Create title text
-        nodes["title"] = self.create_text_node(
-            text=title_text,
-            name="LowerThird_Title",
-            size=0.08,
-            color=text_color,
-            x_pos=2,
-            y_pos=0
-        )
+        # Background, moved to the lower third position
+        spec.add("background", "LowerThird_BG", color=bg_color, x_pos=0, y_pos=0)
+        spec.add("transform", "LowerThird_Transform", center=(0.5, 0.15), size=0.4, x_pos=1, y_pos=0)
+        spec.connect("LowerThird_BG", "LowerThird_Transform")
         
-        # Merge title onto background
-        nodes["title_merge"] = self.create_merge_node(
-            name="LowerThird_TitleMerge",
-            x_pos=3,
-            y_pos=0
-        )
-        
-        self.connect_nodes(nodes["bg_transform"], nodes["title_merge"], input_name="Background")
-        self.connect_nodes(nodes["title"], nodes["title_merge"], input_name="Foreground")
+        # Title merged onto the background
+        spec.add("text", "LowerThird_Title", text=title_text, size=0.08, color=text_color, x_pos=2, y_pos=0)
+        spec.add("merge", "LowerThird_TitleMerge", x_pos=3, y_pos=0)
+        spec.connect("LowerThird_Transform", "LowerThird_TitleMerge", "Background")
+        spec.connect("LowerThird_Title", "LowerThird_TitleMerge", "Foreground")
         
         # Add subtitle if provided
         if subtitle_text:
-            nodes["subtitle"] = self.create_text_node(
-                text=subtitle_text,
-                name="LowerThird_Subtitle",
-                size=0.05,
-                color=text_color,
-                x_pos=4,
-                y_pos=0
-            )
+            self._add_lower_third_subtitle(spec, subtitle_text, text_color)
+        
+        # All nodes and connections in one Fusion transaction
+        created = self.build_graph(spec, undo_name="LowerThird")
+        return {role: created[name] for role, name in LOWER_THIRD_NODES.items() if name in created}
+
+    @staticmethod
+    def _add_lower_third_subtitle(
+        spec: GraphSpec,
+        subtitle_text: str,
+        text_color: Tuple[float, float, float]
+    ):
+        """Add the subtitle text and merge on top of the lower-third title"""
+        spec.add("text", "LowerThird_Subtitle", text=subtitle_text, size=0.05, color=text_color, x_pos=4, y_pos=0)
+        spec.add("merge", "LowerThird_SubtitleMerge", x_pos=5, y_pos=0)
+        spec.connect("LowerThird_TitleMerge", "LowerThird_SubtitleMerge", "Background")
+        spec.connect("LowerThird_Subtitle", "LowerThird_SubtitleMerge", "Foreground")
+
+    def update_lower_third(
+        self,
+        nodes: Dict[str, object],
+        title_text: Optional[str] = None,
+        subtitle_text: Optional[str] = None,
+        bg_color: Optional[Tuple[float, float, float, float]] = None,
+        text_color: Optional[Tuple[float, float, float]] = None
+    ) -> Dict[str, object]:
+        """
+        Change a lower-third built by build_lower_third() in place
+        
+        Only the nodes affected by the given arguments are touched, so
+        editing the subtitle doesn't recreate the background and title.
+        A subtitle branch is added if the template was built without one.
+        
+        Args:
+            nodes: Dictionary returned by build_lower_third()
+            title_text, subtitle_text, bg_color, text_color: New values (None keeps the current one)
+        
+        Returns the (possibly extended) nodes dictionary
+        """
+        with self.batch("LowerThirdUpdate"):
+            if title_text is not None:
+                self.set_node_params(nodes["title"], {"StyledText": title_text})
+            
+            if bg_color is not None:
+                self.set_node_params(nodes["background"], {
+                    "TopLeftRed": bg_color[0],
+                    "TopLeftGreen": bg_color[1],
+                    "TopLeftBlue": bg_color[2],
+                    "TopLeftAlpha": bg_color[3],
+                })
             
-            nodes["subtitle_merge"] = self.create_merge_node(
-                name="LowerThird_SubtitleMerge",
-                x_pos=5,
-                y_pos=0
-            )
+            if subtitle_text is not None:
+                if "subtitle" in nodes:
+                    self.set_node_params(nodes["subtitle"], {"StyledText": subtitle_text})
+                elif subtitle_text:
+                    spec = GraphSpec()
+                    self._add_lower_third_subtitle(spec, subtitle_text, text_color or (1.0, 1.0, 1.0))
+                    created = self.build_graph(spec)
+                    nodes["subtitle"] = created["LowerThird_Subtitle"]
+                    nodes["subtitle_merge"] = created["LowerThird_SubtitleMerge"]
             
-            self.connect_nodes(nodes["title_merge"], nodes["subtitle_merge"], input_name="Background")
-            self.connect_nodes(nodes["subtitle"], nodes["subtitle_merge"], input_name="Foreground")
+            if text_color is not None:
+                color = {"Red": text_color[0], "Green": text_color[1], "Blue": text_color[2]}
+                for key in ("title", "subtitle"):
+                    if key in nodes:
+                        self.set_node_params(nodes[key], color)
+        
+        return nodes
+
+    def create_nodes(self, specs: List[NodeSpec], undo_name: str = "CreateNodes") -> List[Optional[object]]:
+        """
+        Create several nodes in one Fusion transaction
+        
+        Args:
+            specs: Nodes to create (kind picks the create_*_node helper)
+            undo_name: Name of the undo step shown in Fusion
+        
+        Returns the created nodes in spec order (None where creation failed)
+        """
+        with self.batch(undo_name):
+            return [
+                getattr(self, self._CREATORS[node_spec.kind])(name=node_spec.name, **node_spec.params)
+                for node_spec in specs
+            ]
+
+    def build_graph(self, spec: GraphSpec, undo_name: str = "BuildGraph") -> Dict[str, object]:
+        """
+        Create every node and connection in a GraphSpec inside one batch
+        
+        Edges may also name nodes that already exist in the composition.
+        
+        Args:
+            spec: Graph to build
+            undo_name: Name of the undo step shown in Fusion
+        
+        Returns dictionary of created nodes by name
+        """
+        with self.batch(undo_name):
+            created = self.create_nodes(spec.nodes)
+            nodes = {node_spec.name: node for node_spec, node in zip(spec.nodes, created)}
+            
+            self.connect_many([
+                (nodes.get(source) or source, nodes.get(target) or target, input_name)
+                for source, target, input_name in spec.edges
+            ])
         
         return nodes
 
@@ -416,9 +621,12 @@ class FusionNodeBuilder:
             return False
         
         try:
+            # Read the name while the tool still exists
+            node_name = node.GetAttrs()["TOOLS_Name"]
             node.Delete()
+            self._by_type = None
             # Remove from tracking
-            node_name = node.GetAttrs()["TOOLS_Name"]
+            self._name_index.pop(node_name, None)
             if node_name in self.created_nodes:
                 del self.created_nodes[node_name]
             return True
@@ -437,6 +645,8 @@ class FusionNodeBuilder:
                 tool.Delete()
             
             self.created_nodes.clear()
+            self._name_index.clear()
+            self._by_type = None
             return True
         except Exception as e:
             print(f"Error clearing composition: {e}")
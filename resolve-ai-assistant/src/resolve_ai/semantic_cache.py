@@ -0,0 +1,188 @@
+"""
+Semantic Cache - Reuses routing decisions for repeated requests
+
+Iterative editing repeats the same commands a lot ("add a blue glow" again after
+tweaking something). Routing a request costs a Copilot CLI round-trip, so the
+routed task is cached and replayed for requests that normalize to the same text.
+
+With a database path the cache is also written to SQLite, together with the
+images ComfyUI generated, so a new session starts warm.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .task_router import RoutedTask
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = ".!?;, "
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS routed_tasks (
+    key TEXT PRIMARY KEY,
+    task TEXT NOT NULL,
+    used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS images (
+    key TEXT PRIMARY KEY,
+    image_path TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+"""
+
+
+class SemanticCache:
+    """LRU cache of routed tasks keyed by normalized request text"""
+
+    def __init__(self, max_entries: int = 200, path: Optional[Path] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Number of requests kept before evicting the oldest
+            path: SQLite database to persist entries in (None keeps them in memory)
+        """
+        self.max_entries = max_entries
+        self._tasks: "OrderedDict[str, RoutedTask]" = OrderedDict()
+        self._images: Dict[str, Tuple[str, int]] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        # Requests run on a worker thread, not the one that built the cache,
+        # so the connection is shared across threads and serialized here
+        self._db_lock = threading.Lock()
+
+        if path is not None:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(path), check_same_thread=False)
+                self._db.executescript(_SCHEMA)
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️  Cache database unavailable, using memory only: {e}")
+                self._db = None
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Normalize a request for lookup
+
+        Collapses whitespace and drops trailing punctuation. Case is kept
+        because quoted text ("Welcome") ends up in the created nodes.
+        """
+        return _WHITESPACE.sub(" ", text).strip().rstrip(_TRAILING_PUNCTUATION)
+
+    def get(self, user_input: str) -> Optional[RoutedTask]:
+        """Return the cached routed task for a request, if any"""
+        key = self.normalize(user_input)
+        task = self._tasks.get(key)
+        if task is not None:
+            self._tasks.move_to_end(key)
+            return task
+
+        row = self._query("SELECT task FROM routed_tasks WHERE key = ?", (key,))
+        if row is None:
+            return None
+
+        task = RoutedTask(**json.loads(row[0]))
+        self._remember(key, task)
+        self._execute("UPDATE routed_tasks SET used = ? WHERE key = ?", (time.time(), key))
+        return task
+
+    def put(self, user_input: str, task: RoutedTask) -> None:
+        """Cache the routed task for a request"""
+        key = self.normalize(user_input)
+        self._remember(key, task)
+        self._execute(
+            "INSERT OR REPLACE INTO routed_tasks (key, task, used) VALUES (?, ?, ?)",
+            (key, json.dumps(task.to_dict()), time.time())
+        )
+        self._execute(
+            "DELETE FROM routed_tasks WHERE key NOT IN "
+            "(SELECT key FROM routed_tasks ORDER BY used DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+
+    def get_image(self, prompt: str, settings: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+        """
+        Look up an image generated earlier with the same prompt and settings
+
+        Args:
+            prompt: Generation prompt
+            settings: Generation settings (size, steps, cfg)
+
+        Returns:
+            (image_path, seed) if the image is still on disk, otherwise None
+        """
+        key = self._image_key(prompt, settings)
+        entry = self._images.get(key)
+        if entry is None:
+            row = self._query("SELECT image_path, seed FROM images WHERE key = ?", (key,))
+            entry = tuple(row) if row else None
+
+        if entry is None or not os.path.exists(entry[0]):
+            return None
+
+        self._images[key] = entry
+        return entry
+
+    def put_image(self, prompt: str, settings: Dict[str, Any], image_path: str, seed: int) -> None:
+        """Remember a generated image for its prompt and settings"""
+        key = self._image_key(prompt, settings)
+        self._images[key] = (image_path, seed)
+        self._execute(
+            "INSERT OR REPLACE INTO images (key, image_path, seed, created) VALUES (?, ?, ?, ?)",
+            (key, image_path, seed, time.time())
+        )
+
+    def clear(self) -> None:
+        """Drop all cached entries, including the persisted ones"""
+        self._tasks.clear()
+        self._images.clear()
+        self._execute("DELETE FROM routed_tasks")
+        self._execute("DELETE FROM images")
+
+    def close(self) -> None:
+        """Close the cache database"""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, task: RoutedTask) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entry if full"""
+        self._tasks[key] = task
+        self._tasks.move_to_end(key)
+        while len(self._tasks) > self.max_entries:
+            self._tasks.popitem(last=False)
+
+    @staticmethod
+    def _image_key(prompt: str, settings: Dict[str, Any]) -> str:
+        return json.dumps([prompt, sorted(settings.items())])
+
+    def _query(self, sql: str, params: tuple) -> Optional[tuple]:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            try:
+                return self._db.execute(sql, params).fetchone()
+            except sqlite3.Error:
+                return None
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                with self._db:
+                    self._db.execute(sql, params)
+            except sqlite3.Error as e:
+                print(f"⚠️  Cache write failed: {e}")
+
+    def __len__(self) -> int:
+        return len(self._tasks)
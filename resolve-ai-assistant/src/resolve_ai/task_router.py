@@ -2,42 +2,195 @@
 Task Router - Decides between Fusion nodes and ComfyUI generation
 """
 
-from typing import Dict, List, Any, Optional, Literal
+import re
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Literal, Tuple
 from dataclasses import dataclass
-from resolve_ai.copilot_cli import CopilotCLI, CopilotSuggestion
+from resolve_ai.copilot_cli import CopilotCLI, CopilotSuggestion, KeywordScanner
 
 TaskType = Literal['fusion', 'comfyui', 'hybrid']
 
-@dataclass
+# Keywords for the pattern-based step extraction and capability checks
+_TEXT_KWS = ('text', 'title', 'lower-third', 'subtitle')
+_TRANSFORM_KWS = ('move', 'position', 'transform', 'scale', 'rotate')
+_TEXT_AFTER_KWS = ('saying', 'text', 'title', 'subtitle')
+_FUSION_CAPABLE_KWS = (
+    'background', 'gradient', 'text', 'title', 'lower-third',
+    'color', 'blur', 'glow', 'transform', 'position', 'scale',
+    'rotate', 'merge', 'mask', 'brightness', 'contrast', 'effect'
+)
+_FUSION_INCOMPATIBLE_KWS = (
+    'generate', 'create character', 'create scene', 'fantasy',
+    'realistic', 'photo', 'dragon', 'person', 'landscape',
+    'painting', 'artistic', 'ai '
+)
+_COMFYUI_KWS = (
+    'generate', 'create character', 'create scene', 'fantasy',
+    'realistic', 'photorealistic', 'dragon', 'person', 'character',
+    'landscape', 'environment', 'painting', 'artistic style',
+    'ai-generated', 'using ai', 'with ai'
+)
+_EFFECT_KWS = ('background', 'glow', 'blur')
+
+# Checked in order, so the first color named wins. Read-only, since its names
+# are compiled into _KEYWORD_SCANNER at import.
+_COLOR_MAP = MappingProxyType({
+    'red': (1.0, 0.0, 0.0, 1.0),
+    'green': (0.0, 1.0, 0.0, 1.0),
+    'blue': (0.0, 0.0, 1.0, 1.0),
+    'yellow': (1.0, 1.0, 0.0, 1.0),
+    'cyan': (0.0, 1.0, 1.0, 1.0),
+    'magenta': (1.0, 0.0, 1.0, 1.0),
+    'white': (1.0, 1.0, 1.0, 1.0),
+    'black': (0.0, 0.0, 0.0, 1.0),
+    'gray': (0.5, 0.5, 0.5, 1.0),
+    'grey': (0.5, 0.5, 0.5, 1.0)
+})
+_DEFAULT_COLOR = (0.5, 0.5, 0.5, 1.0)  # Gray
+
+# Every keyword and color name above, found in one scan
+_KEYWORD_SCANNER = KeywordScanner(
+    _TEXT_KWS + _TRANSFORM_KWS + _EFFECT_KWS + _FUSION_CAPABLE_KWS
+    + _FUSION_INCOMPATIBLE_KWS + _COMFYUI_KWS + tuple(_COLOR_MAP)
+)
+
+# Fusion steps recognized in a request, in the order they are emitted:
+# (keywords, step type, description, params(router, request, request_lower, hits))
+_STEP_RULES = (
+    (('background',), 'background', 'Create background',
+     lambda router, request, lower, hits: {'color': router._extract_color(lower, hits)}),
+    (_TEXT_KWS, 'text', 'Create text',
+     lambda router, request, lower, hits: {'text': router._extract_text_content(request), 'size': 0.1}),
+    (('glow',), 'glow', 'Add glow effect', lambda *_: {'intensity': 5.0}),
+    (('blur',), 'blur', 'Add blur effect', lambda *_: {'blur_size': 5.0}),
+    (_TRANSFORM_KWS, 'transform', 'Transform element', lambda *_: {}),
+)
+
+# Command words stripped from a request before it becomes a ComfyUI prompt
+_PROMPT_REMOVE_RE = re.compile(r'\b(?:create|generate|make|add|using\s+ai|with\s+ai)\b', re.I)
+
+
+_QUOTED_DQ = re.compile(r'"([^"]+)"')
+_QUOTED_SQ = re.compile(r"'([^']+)'")
+
+
+def _keyword_hits(text_lower: str) -> set:
+    """Return every router keyword that occurs in lowercased text"""
+    return _KEYWORD_SCANNER.scan(text_lower)
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of a step value: dicts become mappingproxies, lists tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Plain dict form of a value made by _freeze"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return tuple(_thaw(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
 class RoutedTask:
-    """Task with routing decision"""
+    """
+    Task with routing decision
+    
+    Immutable, since routed tasks are cached and handed to every caller
+    that repeats a request. Lists passed in are stored as tuples and step
+    dicts (including nested ones such as 'params') as read-only mappings.
+    """
     task_type: TaskType
     description: str
-    fusion_steps: List[Dict[str, Any]]
-    comfyui_prompts: List[str]
-    execution_order: List[str]  # ['fusion_1', 'comfyui_1', 'fusion_2', etc.]
+    fusion_steps: Tuple[Mapping[str, Any], ...]
+    comfyui_prompts: Tuple[str, ...]
+    execution_order: Tuple[str, ...]  # ('fusion_1', 'comfyui_1', 'fusion_2', etc.)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'fusion_steps', tuple(_freeze(step) for step in self.fusion_steps))
+        object.__setattr__(self, 'comfyui_prompts', tuple(self.comfyui_prompts))
+        object.__setattr__(self, 'execution_order', tuple(self.execution_order))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict/list form, e.g. for JSON"""
+        return {
+            'task_type': self.task_type,
+            'description': self.description,
+            'fusion_steps': [_thaw(step) for step in self.fusion_steps],
+            'comfyui_prompts': list(self.comfyui_prompts),
+            'execution_order': list(self.execution_order),
+        }
+
 
 class TaskRouter:
     """Routes tasks to Fusion or ComfyUI based on capabilities"""
     
+    ROUTE_CACHE_SIZE = 512
+    ROUTE_TTL = 3600.0  # Seconds a routing decision is reused for the same request
+    
     def __init__(self, copilot_cli: Optional[CopilotCLI] = None):
         self.copilot_cli = copilot_cli or CopilotCLI()
+        
+        # (request, context) -> (routed at, RoutedTask)
+        self._routes: "OrderedDict[Tuple[str, Optional[str]], Tuple[float, RoutedTask]]" = OrderedDict()
+        self._routes_lock = threading.Lock()
     
-    def route(self, user_request: str, context: Optional[str] = None) -> RoutedTask:
+    def route(
+        self,
+        user_request: str,
+        context: Optional[str] = None,
+        suggestion: Optional[CopilotSuggestion] = None
+    ) -> RoutedTask:
         """
         Analyze request and route to appropriate system
         
         Args:
             user_request: Natural language command
             context: Current composition state
+            suggestion: Copilot analysis already made by the caller (skips a second CLI call)
         
         Returns:
             RoutedTask with execution plan
         """
+        # A caller-supplied suggestion decides the route, so only cache our own
+        if suggestion is not None:
+            return self._route_suggestion(user_request, suggestion)
+        
+        key = (user_request, context)
+        with self._routes_lock:
+            entry = self._routes.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ROUTE_TTL:
+                self._routes.move_to_end(key)
+                return entry[1]
+        
         # Get Copilot's analysis
         suggestion = self.copilot_cli.suggest(user_request, context)
+        routed = self._route_suggestion(user_request, suggestion)
+        
+        with self._routes_lock:
+            self._routes[key] = (time.monotonic(), routed)
+            self._routes.move_to_end(key)
+            while len(self._routes) > self.ROUTE_CACHE_SIZE:
+                self._routes.popitem(last=False)
         
-        # Parse suggestion into concrete steps
+        return routed
+    
+    def clear_cache(self):
+        """Forget cached routing decisions"""
+        with self._routes_lock:
+            self._routes.clear()
+    
+    def _route_suggestion(self, user_request: str, suggestion: CopilotSuggestion) -> RoutedTask:
+        """Parse a Copilot suggestion into concrete steps"""
         if suggestion.task_type == 'fusion':
             return self._route_fusion_task(user_request, suggestion)
         elif suggestion.task_type == 'comfyui':
@@ -105,54 +258,19 @@ class TaskRouter:
     
     def _extract_fusion_steps(self, request: str, suggestion: CopilotSuggestion) -> List[Dict]:
         """Extract Fusion node steps from request"""
-        # Parse common patterns
-        steps = []
-        
         request_lower = request.lower()
+        hits = _keyword_hits(request_lower)
         
-        # Background
-        if 'background' in request_lower:
-            color = self._extract_color(request_lower)
-            steps.append({
-                'type': 'background',
-                'description': 'Create background',
-                'params': {'color': color}
-            })
-        
-        # Text
-        if any(word in request_lower for word in ['text', 'title', 'lower-third', 'subtitle']):
-            text_content = self._extract_text_content(request)
-            steps.append({
-                'type': 'text',
-                'description': 'Create text',
-                'params': {
-                    'text': text_content,
-                    'size': 0.1
-                }
-            })
-        
-        # Effects
-        if 'glow' in request_lower:
-            steps.append({
-                'type': 'glow',
-                'description': 'Add glow effect',
-                'params': {'intensity': 5.0}
-            })
-        
-        if 'blur' in request_lower:
-            steps.append({
-                'type': 'blur',
-                'description': 'Add blur effect',
-                'params': {'blur_size': 5.0}
-            })
-        
-        # Transform
-        if any(word in request_lower for word in ['move', 'position', 'transform', 'scale', 'rotate']):
-            steps.append({
-                'type': 'transform',
-                'description': 'Transform element',
-                'params': {}
-            })
+        # Parse common patterns
+        steps = [
+            {
+                'type': step_type,
+                'description': description,
+                'params': params(self, request, request_lower, hits)
+            }
+            for keywords, step_type, description, params in _STEP_RULES
+            if not hits.isdisjoint(keywords)
+        ]
         
         # If no specific steps identified, create generic step
         if not steps:
@@ -166,64 +284,55 @@ class TaskRouter:
     
     def _extract_comfyui_prompts(self, request: str, suggestion: CopilotSuggestion) -> List[str]:
         """Extract ComfyUI prompts from request"""
-        # Clean up request for use as prompt
-        prompt = request
-        
-        # Remove command words
-        remove_words = ['create', 'generate', 'make', 'add', 'using ai', 'with ai']
-        for word in remove_words:
-            prompt = prompt.replace(word, '')
-        
-        prompt = prompt.strip()
+        # Clean up request for use as prompt (one pass removes every command word)
+        prompt = _PROMPT_REMOVE_RE.sub('', request).strip()
         
         # Enhance prompt for better results
-        if 'background' in request.lower():
+        hits = _keyword_hits(request.lower())
+        if 'background' in hits:
             prompt = f"cinematic background, {prompt}, high quality, detailed"
-        elif 'character' in request.lower():
+        elif 'character' in hits:
             prompt = f"character, {prompt}, professional lighting, detailed"
         else:
             prompt = f"{prompt}, high quality, professional"
         
         return [prompt]
     
-    def _extract_color(self, text: str) -> tuple:
-        """Extract color from text"""
-        color_map = {
-            'red': (1.0, 0.0, 0.0, 1.0),
-            'green': (0.0, 1.0, 0.0, 1.0),
-            'blue': (0.0, 0.0, 1.0, 1.0),
-            'yellow': (1.0, 1.0, 0.0, 1.0),
-            'cyan': (0.0, 1.0, 1.0, 1.0),
-            'magenta': (1.0, 0.0, 1.0, 1.0),
-            'white': (1.0, 1.0, 1.0, 1.0),
-            'black': (0.0, 0.0, 0.0, 1.0),
-            'gray': (0.5, 0.5, 0.5, 1.0),
-            'grey': (0.5, 0.5, 0.5, 1.0)
-        }
+    def _extract_color(self, text: str, hits: Optional[set] = None) -> tuple:
+        """
+        Extract color from text
+        
+        Args:
+            text: Lowercased request
+            hits: Result of the request's keyword scan, if already made
+        """
+        if hits is None:
+            hits = _keyword_hits(text)
         
-        for color_name, color_value in color_map.items():
-            if color_name in text:
+        for color_name, color_value in _COLOR_MAP.items():
+            if color_name in hits:
                 return color_value
         
-        return (0.5, 0.5, 0.5, 1.0)  # Default gray
+        return _DEFAULT_COLOR
     
     def _extract_text_content(self, text: str) -> str:
         """Extract text content from quotes or after certain keywords"""
-        import re
-        
-        # Look for quoted text
-        quoted = re.search(r'"([^"]+)"', text)
-        if quoted:
-            return quoted.group(1)
+        # Look for quoted text (most requests have none, so check before searching)
+        if '"' in text:
+            quoted = _QUOTED_DQ.search(text)
+            if quoted:
+                return quoted.group(1)
         
-        quoted = re.search(r"'([^']+)'", text)
-        if quoted:
-            return quoted.group(1)
+        if "'" in text:
+            quoted = _QUOTED_SQ.search(text)
+            if quoted:
+                return quoted.group(1)
         
         # Look for text after keywords
-        for keyword in ['saying', 'text', 'title', 'subtitle']:
-            if keyword in text.lower():
-                parts = text.lower().split(keyword)
+        text_lower = text.lower()
+        for keyword in _TEXT_AFTER_KWS:
+            if keyword in text_lower:
+                parts = text_lower.split(keyword)
                 if len(parts) > 1:
                     return parts[1].strip().strip('"\'')
         
@@ -231,60 +340,41 @@ class TaskRouter:
     
     def can_use_fusion(self, request: str) -> bool:
         """Check if request can be fulfilled with Fusion alone"""
-        fusion_capable_keywords = [
-            'background', 'gradient', 'text', 'title', 'lower-third',
-            'color', 'blur', 'glow', 'transform', 'position', 'scale',
-            'rotate', 'merge', 'mask', 'brightness', 'contrast', 'effect'
-        ]
-        
-        request_lower = request.lower()
+        hits = _keyword_hits(request.lower())
         
         # Check if any Fusion keywords present
-        has_fusion_keywords = any(kw in request_lower for kw in fusion_capable_keywords)
+        has_fusion_keywords = not hits.isdisjoint(_FUSION_CAPABLE_KWS)
         
         # Check for AI generation keywords (incompatible with Fusion alone)
-        ai_keywords = [
-            'generate', 'create character', 'create scene', 'fantasy',
-            'realistic', 'photo', 'dragon', 'person', 'landscape',
-            'painting', 'artistic', 'ai '
-        ]
-        
-        needs_ai = any(kw in request_lower for kw in ai_keywords)
+        needs_ai = not hits.isdisjoint(_FUSION_INCOMPATIBLE_KWS)
         
         return has_fusion_keywords and not needs_ai
     
     def needs_comfyui(self, request: str) -> bool:
         """Check if request needs ComfyUI generation"""
-        ai_keywords = [
-            'generate', 'create character', 'create scene', 'fantasy',
-            'realistic', 'photorealistic', 'dragon', 'person', 'character',
-            'landscape', 'environment', 'painting', 'artistic style',
-            'ai-generated', 'using ai', 'with ai'
-        ]
-        
-        request_lower = request.lower()
-        return any(kw in request_lower for kw in ai_keywords)
+        return not _keyword_hits(request.lower()).isdisjoint(_COMFYUI_KWS)
 
 
 def format_routed_task(task: RoutedTask) -> str:
     """Format routed task for display"""
-    output = []
-    output.append(f"📋 Task Analysis:")
-    output.append(f"   Type: {task.task_type.upper()}")
-    output.append(f"   Description: {task.description}")
+    output = [
+        "📋 Task Analysis:",
+        f"   Type: {task.task_type.upper()}",
+        f"   Description: {task.description}",
+    ]
     
     if task.fusion_steps:
         output.append(f"\n🎨 Fusion Steps ({len(task.fusion_steps)}):")
-        for i, step in enumerate(task.fusion_steps):
-            output.append(f"   {i+1}. {step.get('description', step.get('type'))}")
+        output += [
+            f"   {i}. {step.get('description', step.get('type'))}"
+            for i, step in enumerate(task.fusion_steps, 1)
+        ]
     
     if task.comfyui_prompts:
         output.append(f"\n🤖 AI Generation ({len(task.comfyui_prompts)}):")
-        for i, prompt in enumerate(task.comfyui_prompts):
-            output.append(f"   {i+1}. {prompt[:60]}...")
+        output += [f"   {i}. {prompt[:60]}..." for i, prompt in enumerate(task.comfyui_prompts, 1)]
     
-    output.append(f"\n📌 Execution Order:")
-    for i, step in enumerate(task.execution_order):
-        output.append(f"   {i+1}. {step}")
+    output.append("\n📌 Execution Order:")
+    output += [f"   {i}. {step}" for i, step in enumerate(task.execution_order, 1)]
     
     return "\n".join(output)
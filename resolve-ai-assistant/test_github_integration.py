@@ -5,6 +5,7 @@ Quick validation script to check if GitHub CLI is working
 
 import sys
 import json
+from collections import defaultdict
 from pathlib import Path
 
 # Add parent directory to path
@@ -34,11 +35,9 @@ def test_list_tools():
     print("\n📋 Available GitHub CLI Tools:")
     print(f"Total: {len(GITHUB_CLI_TOOLS)} tools")
     
-    categories = {}
+    categories = defaultdict(list)
     for tool in GITHUB_CLI_TOOLS:
-        category = tool['name'].split('_')[1]  # gh_issue_list -> issue
-        if category not in categories:
-            categories[category] = []
+        category = tool['name'].partition('_')[2].partition('_')[0]  # gh_issue_list -> issue
         categories[category].append(tool['name'])
     
     for category, tools in sorted(categories.items()):
@@ -0,0 +1,65 @@
+"""Tests for the SQLite-backed semantic cache"""
+
+import os
+import threading
+
+from resolve_ai.semantic_cache import SemanticCache
+from resolve_ai.task_router import RoutedTask
+
+
+def _task() -> RoutedTask:
+    return RoutedTask(
+        task_type='fusion',
+        description='Blue background',
+        fusion_steps=[{'type': 'background', 'params': {'color': (0.0, 0.0, 1.0, 1.0)}}],
+        comfyui_prompts=[],
+        execution_order=['fusion_1'],
+    )
+
+
+def _in_worker(fn) -> None:
+    """Run fn on another thread, as the console UI runs requests"""
+    errors = []
+
+    def run():
+        try:
+            fn()
+        except Exception as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    worker.join()
+    assert not errors, errors
+
+
+def test_writes_from_worker_thread_are_persisted(tmp_path, capsys):
+    db_path = tmp_path / "cache.db"
+    image_path = tmp_path / "image.png"
+    image_path.write_bytes(b"")
+    cache = SemanticCache(path=db_path)
+
+    _in_worker(lambda: cache.put("make a blue background", _task()))
+    _in_worker(lambda: cache.put_image("nebula", {'steps': 15}, str(image_path), 42))
+    cache.close()
+
+    assert "Cache write failed" not in capsys.readouterr().out
+
+    reopened = SemanticCache(path=db_path)
+    assert reopened.get("make a blue background") == _task()
+    assert reopened.get_image("nebula", {'steps': 15}) == (str(image_path), 42)
+    reopened.close()
+
+
+def test_reads_from_worker_thread(tmp_path):
+    db_path = tmp_path / "cache.db"
+    writer = SemanticCache(path=db_path)
+    writer.put("add a glow", _task())
+    writer.close()
+
+    cache = SemanticCache(path=db_path)
+    found = []
+    _in_worker(lambda: found.append(cache.get("add a glow")))
+    cache.close()
+
+    assert found == [_task()]